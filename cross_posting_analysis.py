@@ -2,48 +2,53 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-import networkx as nx
-from collections import Counter
+from network_metrics import pagerank_sparse
+from csv_utils import write_csv
 
-def analyze_crossposters(misinfo_graph, factual_graph, misinfo_content, factual_content):
+def analyze_crossposters(misinfo_graph, factual_graph, misinfo_content, factual_content,
+                         misinfo_pagerank=None, factual_pagerank=None):
     print("Analyzing cross-posting users...")
     
-    misinfo_users = set(misinfo_graph.nodes())
-    factual_users = set(factual_graph.nodes())
+    misinfo_users = pd.Index(misinfo_graph.nodes())
+    factual_users = pd.Index(factual_graph.nodes())
     crossposters = misinfo_users.intersection(factual_users)
+    total_users = len(misinfo_users) + len(factual_users) - len(crossposters)
     
     print(f"Found {len(crossposters)} users who post in both misinformation and factual communities")
-    print(f"This represents {len(crossposters)/len(misinfo_users.union(factual_users)):.2%} of all users")
-    
-    misinfo_pagerank = nx.pagerank(misinfo_graph, max_iter=100)
-    factual_pagerank = nx.pagerank(factual_graph, max_iter=100)
-    
-    misinfo_degree = dict(misinfo_graph.degree())
-    factual_degree = dict(factual_graph.degree())
-    
-    crossposter_data = []
-    for user in crossposters:
-        crossposter_data.append({
-            'user': user,
-            'misinfo_pagerank': misinfo_pagerank.get(user, 0),
-            'factual_pagerank': factual_pagerank.get(user, 0),
-            'misinfo_degree': misinfo_degree.get(user, 0),
-            'factual_degree': factual_degree.get(user, 0),
-            'total_pagerank': misinfo_pagerank.get(user, 0) + factual_pagerank.get(user, 0),
-            'total_degree': misinfo_degree.get(user, 0) + factual_degree.get(user, 0)
+    print(f"This represents {len(crossposters)/total_users:.2%} of all users")
+    
+    if misinfo_pagerank is None:
+        misinfo_pagerank = pagerank_sparse(misinfo_graph, max_iter=100)
+    if factual_pagerank is None:
+        factual_pagerank = pagerank_sparse(factual_graph, max_iter=100)
+    
+    users = crossposters.to_numpy(dtype=object)
+    n_users = len(users)
+    
+    misinfo_pr = np.fromiter((misinfo_pagerank.get(u, 0) for u in users), dtype=np.float64, count=n_users)
+    factual_pr = np.fromiter((factual_pagerank.get(u, 0) for u in users), dtype=np.float64, count=n_users)
+    misinfo_deg = np.fromiter((d for _, d in misinfo_graph.degree(users)), dtype=np.int64, count=n_users)
+    factual_deg = np.fromiter((d for _, d in factual_graph.degree(users)), dtype=np.int64, count=n_users)
+    
+    if n_users:
+        crossposter_df = pd.DataFrame({
+            'user': users,
+            'misinfo_pagerank': misinfo_pr,
+            'factual_pagerank': factual_pr,
+            'misinfo_degree': misinfo_deg,
+            'factual_degree': factual_deg,
+            'total_pagerank': misinfo_pr + factual_pr,
+            'total_degree': misinfo_deg + factual_deg
         })
-    
-    if crossposter_data:
-        crossposter_df = pd.DataFrame(crossposter_data)
         
-        top_crossposters = crossposter_df.sort_values('total_pagerank', ascending=False).head(20)
+        top_crossposters = crossposter_df.nlargest(20, 'total_pagerank')
         
-        crossposter_df.to_csv('results/crossposters_analysis.csv', index=False)
-        top_crossposters.to_csv('results/top_crossposters.csv', index=False)
+        write_csv(crossposter_df, 'results/crossposters_analysis.csv')
+        write_csv(top_crossposters, 'results/top_crossposters.csv')
         print(f"Crossposters analysis saved to results/crossposters_analysis.csv")
         print(f"Top crossposters saved to results/top_crossposters.csv")
         
-        visualize_crossposter_influence(crossposter_df)
+        visualize_crossposter_influence(crossposter_df, top_crossposters.head(10))
         
         subreddit_analysis = analyze_crossposter_subreddits(crossposters, misinfo_content, factual_content)
         
@@ -62,29 +67,38 @@ def analyze_crossposters(misinfo_graph, factual_graph, misinfo_content, factual_
             'subreddit_analysis': None
         }
 
-def visualize_crossposter_influence(crossposter_df):
+def visualize_crossposter_influence(crossposter_df, top_users=None):
     if crossposter_df.empty:
         print("No data for crossposter influence visualization")
         return
     
+    if top_users is None:
+        top_users = crossposter_df.nlargest(10, 'total_pagerank')
+    
+    misinfo_pr = crossposter_df['misinfo_pagerank'].to_numpy()
+    factual_pr = crossposter_df['factual_pagerank'].to_numpy()
+    
     plt.figure(figsize=(10, 8))
     plt.scatter(
-        crossposter_df['misinfo_pagerank'], 
-        crossposter_df['factual_pagerank'],
+        misinfo_pr, 
+        factual_pr,
         alpha=0.7,
-        s=crossposter_df['total_degree'] * 3,
-        c=crossposter_df['misinfo_pagerank'] / (crossposter_df['misinfo_pagerank'] + crossposter_df['factual_pagerank']),
+        s=crossposter_df['total_degree'].to_numpy() * 3,
+        c=misinfo_pr / (misinfo_pr + factual_pr),
         cmap='coolwarm'
     )
     
     cbar = plt.colorbar()
     cbar.set_label('Proportion of Influence in Misinformation Network')
     
-    top_users = crossposter_df.sort_values('total_pagerank', ascending=False).head(10)
-    for _, user in top_users.iterrows():
+    top_names = top_users['user'].to_numpy()
+    top_misinfo_pr = top_users['misinfo_pagerank'].to_numpy()
+    top_factual_pr = top_users['factual_pagerank'].to_numpy()
+    
+    for name, x, y in zip(top_names, top_misinfo_pr, top_factual_pr):
         plt.annotate(
-            user['user'],
-            (user['misinfo_pagerank'], user['factual_pagerank']),
+            name,
+            (x, y),
             xytext=(5, 5),
             textcoords='offset points'
         )
@@ -100,12 +114,10 @@ def visualize_crossposter_influence(crossposter_df):
     plt.close()
     print("Crossposter influence visualization saved to results/crossposter_influence.png")
     
-    top_users = crossposter_df.sort_values('total_pagerank', ascending=False).head(10)
-    
     plt.figure(figsize=(12, 6))
     
-    bars = plt.bar(top_users['user'], top_users['misinfo_pagerank'], color='red', label='Misinformation')
-    plt.bar(top_users['user'], top_users['factual_pagerank'], bottom=top_users['misinfo_pagerank'], color='blue', label='Factual')
+    bars = plt.bar(top_names, top_misinfo_pr, color='red', label='Misinformation')
+    plt.bar(top_names, top_factual_pr, bottom=top_misinfo_pr, color='blue', label='Factual')
     
     plt.xlabel('User')
     plt.ylabel('PageRank')
@@ -125,31 +137,29 @@ def analyze_crossposter_subreddits(crossposters, misinfo_content, factual_conten
     misinfo_sub_counts = misinfo_crossposter_content['subreddit'].value_counts()
     factual_sub_counts = factual_crossposter_content['subreddit'].value_counts()
     
-    sub_pairs = []
-
-    misinfo_by_author = misinfo_crossposter_content.groupby('author')['subreddit'].unique()
-    factual_by_author = factual_crossposter_content.groupby('author')['subreddit'].unique()
-    
-    for author in crossposters:
-        if author in misinfo_by_author and author in factual_by_author:
-            misinfo_subs = misinfo_by_author[author]
-            factual_subs = factual_by_author[author]
-            
-            for m_sub in misinfo_subs:
-                for f_sub in factual_subs:
-                    sub_pairs.append((m_sub, f_sub))
+    misinfo_author_subs = misinfo_crossposter_content[['author', 'subreddit']].drop_duplicates()
+    factual_author_subs = factual_crossposter_content[['author', 'subreddit']].drop_duplicates()
+    pairs = misinfo_author_subs.reset_index(names='row_m').merge(
+        factual_author_subs.reset_index(names='row_f'), on='author', suffixes=('_m', '_f')
+    )
     
-    pair_counts = Counter(sub_pairs)
+    author_order = {author: i for i, author in enumerate(crossposters)}
+    pairs['author_order'] = pairs['author'].map(author_order).astype(np.int64)
+    pairs = pairs.sort_values(['author_order', 'row_m', 'row_f'], kind='stable')
+    pair_counts = (
+        pairs.groupby(['subreddit_m', 'subreddit_f'], sort=False).size()
+        .sort_values(ascending=False, kind='stable')
+    )
     
     visualize_crossposter_subreddits(misinfo_sub_counts, factual_sub_counts, pair_counts)
     
-    pair_df = pd.DataFrame([
-        {'misinfo_subreddit': m, 'factual_subreddit': f, 'count': count}
-        for (m, f), count in pair_counts.most_common()
-    ])
+    pair_df = pair_counts.reset_index(name='count').rename(columns={
+        'subreddit_m': 'misinfo_subreddit',
+        'subreddit_f': 'factual_subreddit'
+    })
     
     if not pair_df.empty:
-        pair_df.to_csv('results/subreddit_pairs.csv', index=False)
+        write_csv(pair_df, 'results/subreddit_pairs.csv')
         print("Subreddit pair analysis saved to results/subreddit_pairs.csv")
     
     return {
@@ -170,8 +180,7 @@ def visualize_crossposter_subreddits(misinfo_counts, factual_counts, pair_counts
     ax1 = sns.barplot(x='Subreddit', y='Count', data=misinfo_df, color='red')
     plt.title('Cross-Poster Participation in Misinformation Subreddits')
     plt.xticks(rotation=45, ha='right')
-    for i, v in enumerate(misinfo_df['Count']):
-        ax1.text(i, v + 5, str(v), ha='center')
+    ax1.bar_label(ax1.containers[0], padding=3)
     
     plt.subplot(2, 1, 2)
     factual_df = pd.DataFrame({
@@ -182,8 +191,7 @@ def visualize_crossposter_subreddits(misinfo_counts, factual_counts, pair_counts
     ax2 = sns.barplot(x='Subreddit', y='Count', data=factual_df, color='blue')
     plt.title('Cross-Poster Participation in Factual Subreddits')
     plt.xticks(rotation=45, ha='right')
-    for i, v in enumerate(factual_df['Count']):
-        ax2.text(i, v + 5, str(v), ha='center')
+    ax2.bar_label(ax2.containers[0], padding=3)
     
     plt.tight_layout()
     plt.savefig("results/crossposter_subreddits.png", dpi=300, bbox_inches='tight')
@@ -194,11 +202,9 @@ def visualize_crossposter_subreddits(misinfo_counts, factual_counts, pair_counts
         top_misinfo = misinfo_counts.head(5).index
         top_factual = factual_counts.head(5).index
         
-        matrix = np.zeros((len(top_misinfo), len(top_factual)))
-        
-        for i, m_sub in enumerate(top_misinfo):
-            for j, f_sub in enumerate(top_factual):
-                matrix[i, j] = pair_counts.get((m_sub, f_sub), 0)
+        matrix = pair_counts.unstack(fill_value=0).reindex(
+            index=top_misinfo, columns=top_factual, fill_value=0
+        ).to_numpy()
         
         plt.figure(figsize=(12, 8))
         sns.heatmap(
@@ -221,7 +227,7 @@ def visualize_crossposter_subreddits(misinfo_counts, factual_counts, pair_counts
         
         top_pairs = pd.DataFrame([
             {'Pair': f"{m} → {f}", 'Count': count}
-            for (m, f), count in pair_counts.most_common(10)
+            for (m, f), count in pair_counts.head(10).items()
         ])
         
         plt.figure(figsize=(12, 6))
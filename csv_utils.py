@@ -0,0 +1,78 @@
+import csv
+import io
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+
+def read_csv(path, columns, categorical=()):
+    if pacsv is None:
+        dtype = {col: 'category' if col in categorical else str for col in columns}
+        return pd.read_csv(path, usecols=columns, dtype=dtype)
+
+    column_types = {
+        col: pa.dictionary(pa.int32(), pa.string()) if col in categorical else pa.string()
+        for col in columns
+    }
+    table = pacsv.read_csv(
+        path,
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=list(columns),
+            column_types=column_types,
+            strings_can_be_null=True,
+            null_values=pacsv.ConvertOptions().null_values + ['None', '<NA>']
+        )
+    )
+    return table.to_pandas()
+
+DELETED_AUTHOR = '[deleted]'
+
+def fill_missing(df, columns, value):
+    for col in columns:
+        values = df[col]
+        if not values.hasnans:
+            continue
+        if isinstance(values.dtype, pd.CategoricalDtype) and value not in values.cat.categories:
+            values = values.cat.add_categories([value])
+        df[col] = values.fillna(value)
+    return df
+
+def _write_table(table, path):
+    for field in table.schema:
+        value_type = field.type.value_type if pa.types.is_dictionary(field.type) else field.type
+        if not (pa.types.is_string(value_type) or pa.types.is_large_string(value_type)
+                or pa.types.is_integer(value_type)):
+            raise pa.ArrowInvalid(f"column {field.name} is not written like DataFrame.to_csv")
+    if table.num_columns < 2:
+        raise pa.ArrowInvalid("csv quotes a lone empty field, Arrow does not")
+
+    header = io.StringIO()
+    csv.writer(header, lineterminator='\n').writerow(table.column_names)
+    with open(path, 'wb') as f:
+        f.write(header.getvalue().encode())
+        pacsv.write_csv(table, f, write_options=pacsv.WriteOptions(include_header=False, quoting_style='none'))
+
+def write_csv(df, path):
+    if pacsv is None:
+        df.to_csv(path, index=False)
+        return
+
+    try:
+        _write_table(pa.Table.from_pandas(df, preserve_index=False), path)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        df.to_csv(path, index=False)
+
+def write_columns(columns, path):
+    if pacsv is None:
+        pd.DataFrame(columns).to_csv(path, index=False)
+        return
+
+    try:
+        _write_table(pa.table({name: pa.array(values, from_pandas=True) for name, values in columns.items()}), path)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pd.DataFrame(columns).to_csv(path, index=False)
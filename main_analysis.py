@@ -8,10 +8,12 @@ and performs the primary analysis for the project.
 """
 
 import pandas as pd
+import numpy as np
 import networkx as nx
 import os
 import time
-from network_metrics import calculate_network_metrics, detect_communities
+from csv_utils import DELETED_AUTHOR, fill_missing, read_csv, write_csv
+from network_metrics import calculate_network_metrics, detect_communities, undirected_topology, adjacency_csr
 from visualization import (
     visualize_networks_comparison, 
     visualize_combined_network,
@@ -26,14 +28,24 @@ FACTUAL_EDGES_PATH = 'reddit_data/network_edges_factual_20250408_141247.csv'
 MISINFO_CONTENT_PATH = 'reddit_data/all_content_misinformation_20250408_140600.csv'
 FACTUAL_CONTENT_PATH = 'reddit_data/all_content_factual_20250408_141247.csv'
 
+EDGE_COLUMNS = ['source', 'target', 'subreddit', 'category', 'created_utc']
+EDGE_CATEGORICAL = ['source', 'target', 'subreddit', 'category']
+CONTENT_COLUMNS = ['author', 'subreddit']
+CONTENT_CATEGORICAL = ['author']
+
 def load_data():
     print("Loading network edge data...")
-    misinfo_edges = pd.read_csv(MISINFO_EDGES_PATH)
-    factual_edges = pd.read_csv(FACTUAL_EDGES_PATH)
+    misinfo_edges = read_csv(MISINFO_EDGES_PATH, EDGE_COLUMNS, EDGE_CATEGORICAL)
+    factual_edges = read_csv(FACTUAL_EDGES_PATH, EDGE_COLUMNS, EDGE_CATEGORICAL)
     
     print("Loading content data...")
-    misinfo_content = pd.read_csv(MISINFO_CONTENT_PATH)
-    factual_content = pd.read_csv(FACTUAL_CONTENT_PATH)
+    misinfo_content = read_csv(MISINFO_CONTENT_PATH, CONTENT_COLUMNS, CONTENT_CATEGORICAL)
+    factual_content = read_csv(FACTUAL_CONTENT_PATH, CONTENT_COLUMNS, CONTENT_CATEGORICAL)
+    
+    for edges in (misinfo_edges, factual_edges):
+        fill_missing(edges, ['source', 'target'], DELETED_AUTHOR)
+    for content in (misinfo_content, factual_content):
+        fill_missing(content, ['author'], DELETED_AUTHOR)
     
     return misinfo_edges, factual_edges, misinfo_content, factual_content
 
@@ -58,48 +70,57 @@ def build_networks(misinfo_edges, factual_edges):
         create_using=nx.DiGraph()
     )
     
-    all_edges = pd.concat([misinfo_edges, factual_edges])
-    combined_graph = nx.from_pandas_edgelist(
-        all_edges, 
-        source='source', 
-        target='target', 
-        edge_attr=['subreddit', 'category', 'created_utc'],
-        create_using=nx.DiGraph()
-    )
+    combined_sources = np.concatenate([misinfo_edges['source'].to_numpy(), factual_edges['source'].to_numpy()])
+    combined_targets = np.concatenate([misinfo_edges['target'].to_numpy(), factual_edges['target'].to_numpy()])
+    combined_graph = nx.DiGraph()
+    combined_graph.add_edges_from(zip(combined_sources.tolist(), combined_targets.tolist()))
     
     print(f"Misinformation network: {misinfo_graph.number_of_nodes()} nodes, {misinfo_graph.number_of_edges()} edges")
     print(f"Factual network: {factual_graph.number_of_nodes()} nodes, {factual_graph.number_of_edges()} edges")
     print(f"Combined network: {combined_graph.number_of_nodes()} nodes, {combined_graph.number_of_edges()} edges")
     
-    return misinfo_graph, factual_graph, combined_graph
+    misinfo_adjacency = adjacency_csr(misinfo_graph)
+    factual_adjacency = adjacency_csr(factual_graph)
+    
+    return misinfo_graph, factual_graph, combined_graph, misinfo_adjacency, factual_adjacency
 
 def main():
     os.makedirs('results', exist_ok=True)
     
     misinfo_edges, factual_edges, misinfo_content, factual_content = load_data()
     
-    misinfo_graph, factual_graph, combined_graph = build_networks(misinfo_edges, factual_edges)
+    misinfo_graph, factual_graph, combined_graph, misinfo_adjacency, factual_adjacency = build_networks(
+        misinfo_edges, factual_edges
+    )
+    misinfo_undirected = undirected_topology(misinfo_graph)
+    factual_undirected = undirected_topology(factual_graph)
     
     print("\nCalculating network metrics...")
-    misinfo_metrics, factual_metrics = calculate_network_metrics(misinfo_graph, factual_graph)
+    misinfo_metrics, factual_metrics, misinfo_pagerank, factual_pagerank = calculate_network_metrics(
+        misinfo_graph, factual_graph, misinfo_adjacency, factual_adjacency
+    )
     
     metrics_comparison = pd.DataFrame({
         'Metric': list(misinfo_metrics.keys()),
         'Misinformation': list(misinfo_metrics.values()),
         'Factual': list(factual_metrics.values())
     })
-    metrics_comparison.to_csv('results/network_metrics_comparison.csv', index=False)
+    write_csv(metrics_comparison, 'results/network_metrics_comparison.csv')
     print("Network metrics saved to results/network_metrics_comparison.csv")
     
     print("\nDetecting communities...")
-    misinfo_communities, factual_communities = detect_communities(misinfo_graph, factual_graph)
+    misinfo_communities, factual_communities = detect_communities(
+        misinfo_graph, factual_graph, misinfo_undirected, factual_undirected
+    )
     
     print("\nAnalyzing cross-posting users...")
     crossposter_results = analyze_crossposters(
         misinfo_graph, 
         factual_graph, 
         misinfo_content, 
-        factual_content
+        factual_content,
+        misinfo_pagerank=misinfo_pagerank,
+        factual_pagerank=factual_pagerank
     )
     
     print("\nCreating visualizations...")
@@ -1,37 +1,285 @@
 import networkx as nx
 import pandas as pd
 import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components, shortest_path
 import community as community_louvain
 import matplotlib.pyplot as plt
+import os
+import random
+import heapq
+import operator
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from csv_utils import write_columns, write_csv
 
-def calculate_network_metrics(misinfo_graph, factual_graph):
+try:
+    import networkit as nk
+except ImportError:
+    nk = None
 
-    misinfo_metrics = {}
-    factual_metrics = {}
+try:
+    import igraph as ig
+except ImportError:
+    ig = None
+
+try:
+    import rustworkx as rx
+except ImportError:
+    rx = None
+
+try:
+    from network_metrics_numba import pagerank_csr as pagerank_csr_numba
+    from network_metrics_numba import pagerank_gs_csr as pagerank_gs_csr_numba
+    from network_metrics_numba import betweenness_csr as betweenness_csr_numba
+except ImportError:
+    pagerank_csr_numba = None
+    pagerank_gs_csr_numba = None
+    betweenness_csr_numba = None
+
+def adjacency_csr(graph):
+    nodelist = list(graph)
+    A = nx.to_scipy_sparse_array(graph, nodelist=nodelist, weight=None, dtype=np.float32, format='csr')
+    return A, nodelist
+
+def _pagerank_start(nodelist, nstart):
+    if nstart is None:
+        return np.full(len(nodelist), 1.0 / len(nodelist), dtype=np.float32)
+    x = np.array([nstart.get(node, 0) for node in nodelist], dtype=np.float32)
+    return x / x.sum()
+
+def pagerank_sparse(graph, alpha=0.85, max_iter=100, tol=1.0e-6, nstart=None, adjacency=None):
+    A, nodelist = adjacency if adjacency is not None else adjacency_csr(graph)
+    N = len(nodelist)
+    if N == 0:
+        return {}
+    
+    out_degree = np.diff(A.indptr).astype(np.float32)
+    x = _pagerank_start(nodelist, nstart)
+    
+    if pagerank_csr_numba is not None:
+        A_T = A.T.tocsr()
+        x, converged = pagerank_csr_numba(A_T.indptr, A_T.indices, out_degree, x, alpha, max_iter, tol)
+        if not converged:
+            raise nx.PowerIterationFailedConvergence(max_iter)
+        return dict(zip(nodelist, x.tolist()))
+    
+    dangling = out_degree == 0
+    inv_out_degree = np.zeros(N, dtype=np.float32)
+    inv_out_degree[~dangling] = 1.0 / out_degree[~dangling]
+    M_T = (sp.diags_array(inv_out_degree) @ A).T.tocsr()
+    
+    for _ in range(max_iter):
+        x_prev = x
+        x = alpha * (M_T @ x_prev + x_prev[dangling].sum() / N) + (1 - alpha) / N
+        if np.abs(x - x_prev).sum() < N * tol:
+            return dict(zip(nodelist, x.tolist()))
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+def pagerank_gauss_seidel(graph, alpha=0.85, max_iter=100, tol=1.0e-6, nstart=None, adjacency=None):
+    if pagerank_gs_csr_numba is None:
+        return pagerank_sparse(graph, alpha, max_iter, tol, nstart=nstart, adjacency=adjacency)
+    
+    A, nodelist = adjacency if adjacency is not None else adjacency_csr(graph)
+    N = len(nodelist)
+    if N == 0:
+        return {}
+    
+    out_degree = np.diff(A.indptr).astype(np.float32)
+    A_T = A.T.tocsr()
+    x, converged = pagerank_gs_csr_numba(
+        A_T.indptr, A_T.indices, out_degree, _pagerank_start(nodelist, nstart), alpha, max_iter, tol
+    )
+    if not converged:
+        raise nx.PowerIterationFailedConvergence(max_iter)
+    return dict(zip(nodelist, x.tolist()))
+
+def rustworkx_graph(graph):
+    if rx is None:
+        return None
+    return rx.networkx_converter(graph)
+
+def pagerank_rustworkx(graph, alpha=0.85, max_iter=100, tol=1.0e-6, rx_graph=None):
+    if rx is None:
+        return pagerank_sparse(graph, alpha, max_iter, tol)
+    if rx_graph is None:
+        rx_graph = rustworkx_graph(graph)
+    try:
+        scores = rx.pagerank(rx_graph, alpha=alpha, max_iter=max_iter, tol=tol)
+    except rx.FailedToConverge:
+        raise nx.PowerIterationFailedConvergence(max_iter)
+    nodelist = rx_graph.nodes()
+    return {nodelist[i]: score for i, score in scores.items()}
+
+def largest_weak_component_nodes(graph, rx_graph=None):
+    if rx is None:
+        A, nodelist = adjacency_csr(graph)
+        return {nodelist[i] for i in largest_weak_component(A)}
+    if rx_graph is None:
+        rx_graph = rustworkx_graph(graph)
+    nodelist = rx_graph.nodes()
+    component = max(rx.weakly_connected_components(rx_graph), key=len)
+    return {nodelist[i] for i in component}
+
+def _betweenness_from_sources(graph, sources):
+    return nx.betweenness_centrality_subset(graph, sources, list(graph), normalized=False)
+
+def betweenness_centrality_approx(graph, k=500, seed=None, processes=None, adjacency=None):
+    N = graph.number_of_nodes()
+    k = min(k, N)
     
-    misinfo_metrics['nodes'] = misinfo_graph.number_of_nodes()
-    misinfo_metrics['edges'] = misinfo_graph.number_of_edges()
-    misinfo_metrics['density'] = nx.density(misinfo_graph)
+    if nk is not None:
+        nk_graph = nk.nxadapter.nx2nk(graph)
+        estimate = nk.centrality.EstimateBetweenness(nk_graph, k, normalized=True, parallel=True)
+        estimate.run()
+        return dict(zip(graph, estimate.scores()))
     
-    factual_metrics['nodes'] = factual_graph.number_of_nodes()
-    factual_metrics['edges'] = factual_graph.number_of_edges()
-    factual_metrics['density'] = nx.density(factual_graph)
+    sources = random.Random(seed).sample(list(graph), k)
+    processes = min(processes or os.cpu_count() or 1, k) or 1
     
-    misinfo_degrees = [d for n, d in misinfo_graph.degree()]
-    factual_degrees = [d for n, d in factual_graph.degree()]
+    if betweenness_csr_numba is not None:
+        A, nodelist = adjacency if adjacency is not None else adjacency_csr(graph)
+        index = {node: i for i, node in enumerate(nodelist)}
+        A_T = A.T.tocsr()
+        raw = betweenness_csr_numba(
+            A.indptr, A.indices, A_T.indptr, A_T.indices,
+            np.array([index[node] for node in sources], dtype=np.int64), processes
+        )
+        if N > 2:
+            raw *= N / (k * (N - 1) * (N - 2))
+        return dict(zip(nodelist, raw.tolist()))
     
-    misinfo_metrics['avg_degree'] = np.mean(misinfo_degrees)
-    factual_metrics['avg_degree'] = np.mean(factual_degrees)
+    chunks = [sources[i::processes] for i in range(processes)]
     
-    print("Calculating PageRank...")
-    misinfo_pagerank = nx.pagerank(misinfo_graph, max_iter=100)
-    factual_pagerank = nx.pagerank(factual_graph, max_iter=100)
+    if processes == 1:
+        partials = [_betweenness_from_sources(graph, sources)]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn')) as executor:
+            partials = list(executor.map(_betweenness_from_sources, [graph] * processes, chunks))
     
-    misinfo_metrics['max_pagerank'] = max(misinfo_pagerank.values())
-    factual_metrics['max_pagerank'] = max(factual_pagerank.values())
+    betweenness = dict.fromkeys(graph, 0.0)
+    for partial in partials:
+        for node, value in partial.items():
+            betweenness[node] += value
     
-    top_misinfo_users = sorted(misinfo_pagerank.items(), key=lambda x: x[1], reverse=True)[:10]
-    top_factual_users = sorted(factual_pagerank.items(), key=lambda x: x[1], reverse=True)[:10]
+    if N > 2:
+        scale = N / (k * (N - 1) * (N - 2))
+        if not graph.is_directed():
+            scale *= 2
+        for node in betweenness:
+            betweenness[node] *= scale
+    return betweenness
+
+def undirected_topology(graph):
+    undirected = nx.Graph()
+    undirected.add_nodes_from(graph)
+    undirected.add_edges_from(graph.edges())
+    return undirected
+
+def average_clustering_sparse(A):
+    N = A.shape[0]
+    A = ((A + A.T) != 0).astype(np.int64)
+    A = (sp.triu(A, k=1) + sp.tril(A, k=-1)).tocsr()
+    
+    degree = np.diff(A.indptr)
+    triangles = np.asarray((A @ A).multiply(A).sum(axis=1)).ravel() / 2
+    possible = degree * (degree - 1) / 2
+    clustering = np.divide(triangles, possible, out=np.zeros(N), where=possible > 0)
+    return float(clustering.mean())
+
+def density_csr(A):
+    N = A.shape[0]
+    return A.nnz / (N * (N - 1)) if N > 1 else 0
+
+def degrees_csr(A):
+    return np.diff(A.indptr) + np.bincount(A.indices, minlength=A.shape[0])
+
+def largest_weak_component(A):
+    _, labels = connected_components(A, directed=True, connection='weak')
+    sizes = np.bincount(labels)
+    return np.flatnonzero(labels == sizes.argmax())
+
+def average_path_length_sampled(A, component, n_sources=100, exact_limit=1000, seed=42):
+    sub = A[component][:, component]
+    n = len(component)
+    exact = n <= exact_limit
+    if exact:
+        sources = np.arange(n)
+    else:
+        sources = np.random.default_rng(seed).choice(n, size=n_sources, replace=False)
+    
+    total = 0.0
+    count = 0
+    for batch in np.array_split(sources, max(1, len(sources) // 10)):
+        D = shortest_path(sub, directed=False, unweighted=True, indices=batch)
+        reachable = D[np.isfinite(D) & (D > 0)]
+        total += reachable.sum()
+        count += reachable.size
+    return (float(total / count) if count else None), exact
+
+def _metrics_for_one(name, graph, adjacency, betweenness_processes=None):
+    if adjacency is None:
+        adjacency = adjacency_csr(graph)
+    A = adjacency[0]
+    metrics = {}
+    
+    metrics['nodes'] = A.shape[0]
+    metrics['edges'] = A.nnz
+    metrics['density'] = density_csr(A)
+    metrics['avg_degree'] = np.mean(degrees_csr(A))
+    
+    print(f"[{name}] Calculating PageRank...")
+    pagerank = pagerank_sparse(graph, max_iter=100, adjacency=adjacency)
+    metrics['max_pagerank'] = max(pagerank.values())
+    
+    print(f"[{name}] Calculating approximate betweenness centrality (this may take a while)...")
+    betweenness = betweenness_centrality_approx(
+        graph, k=500, processes=betweenness_processes, adjacency=adjacency
+    )
+    metrics['max_betweenness'] = max(betweenness.values())
+    
+    print(f"[{name}] Calculating clustering coefficients...")
+    metrics['clustering_coefficient'] = average_clustering_sparse(A)
+    
+    largest_idx = largest_weak_component(A)
+    metrics['largest_component_size'] = len(largest_idx)
+    metrics['largest_component_percentage'] = len(largest_idx) / A.shape[0]
+    
+    try:
+        metrics['avg_path_length'], exact = average_path_length_sampled(A, largest_idx)
+        if exact:
+            metrics['avg_path_length_note'] = 'Exact over the largest component (undirected)'
+        else:
+            metrics['avg_path_length_note'] = 'Estimated by BFS from 100 sampled nodes (undirected)'
+    except Exception as e:
+        metrics['avg_path_length'] = None
+        metrics['avg_path_length_note'] = f'Could not compute: {e}'
+    
+    return metrics, pagerank, betweenness
+
+def calculate_network_metrics(misinfo_graph, factual_graph, misinfo_adjacency=None, factual_adjacency=None,
+                              parallel=False):
+    if parallel:
+        betweenness_processes = max(1, (os.cpu_count() or 1) // 2)
+        with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn')) as executor:
+            misinfo_future = executor.submit(
+                _metrics_for_one, 'misinfo', misinfo_graph, misinfo_adjacency, betweenness_processes
+            )
+            factual_future = executor.submit(
+                _metrics_for_one, 'factual', factual_graph, factual_adjacency, betweenness_processes
+            )
+            misinfo_metrics, misinfo_pagerank, misinfo_betweenness = misinfo_future.result()
+            factual_metrics, factual_pagerank, factual_betweenness = factual_future.result()
+    else:
+        misinfo_metrics, misinfo_pagerank, misinfo_betweenness = _metrics_for_one(
+            'misinfo', misinfo_graph, misinfo_adjacency
+        )
+        factual_metrics, factual_pagerank, factual_betweenness = _metrics_for_one(
+            'factual', factual_graph, factual_adjacency
+        )
+    
+    top_misinfo_users = heapq.nlargest(10, misinfo_pagerank.items(), key=operator.itemgetter(1))
+    top_factual_users = heapq.nlargest(10, factual_pagerank.items(), key=operator.itemgetter(1))
     
     top_users_df = pd.DataFrame({
         'Rank': list(range(1, 11)),
@@ -40,18 +288,11 @@ def calculate_network_metrics(misinfo_graph, factual_graph):
         'Factual_User': [user for user, _ in top_factual_users],
         'Factual_PageRank': [score for _, score in top_factual_users]
     })
-    top_users_df.to_csv('results/top_influential_users.csv', index=False)
+    write_csv(top_users_df, 'results/top_influential_users.csv')
     print("Top influential users saved to results/top_influential_users.csv")
     
-    print("Calculating approximate betweenness centrality (this may take a while)...")
-    misinfo_betweenness = nx.betweenness_centrality(misinfo_graph, k=500, normalized=True)
-    factual_betweenness = nx.betweenness_centrality(factual_graph, k=500, normalized=True)
-    
-    misinfo_metrics['max_betweenness'] = max(misinfo_betweenness.values())
-    factual_metrics['max_betweenness'] = max(factual_betweenness.values())
-    
-    top_misinfo_bridges = sorted(misinfo_betweenness.items(), key=lambda x: x[1], reverse=True)[:10]
-    top_factual_bridges = sorted(factual_betweenness.items(), key=lambda x: x[1], reverse=True)[:10]
+    top_misinfo_bridges = heapq.nlargest(10, misinfo_betweenness.items(), key=operator.itemgetter(1))
+    top_factual_bridges = heapq.nlargest(10, factual_betweenness.items(), key=operator.itemgetter(1))
     
     top_bridges_df = pd.DataFrame({
         'Rank': list(range(1, 11)),
@@ -60,90 +301,71 @@ def calculate_network_metrics(misinfo_graph, factual_graph):
         'Factual_User': [user for user, _ in top_factual_bridges],
         'Factual_Betweenness': [score for _, score in top_factual_bridges]
     })
-    top_bridges_df.to_csv('results/top_bridge_users.csv', index=False)
+    write_csv(top_bridges_df, 'results/top_bridge_users.csv')
     print("Top bridge users saved to results/top_bridge_users.csv")
-
-    print("Calculating clustering coefficients...")
-    misinfo_undirected = misinfo_graph.to_undirected()
-    factual_undirected = factual_graph.to_undirected()
-    
-    misinfo_metrics['clustering_coefficient'] = nx.average_clustering(misinfo_undirected)
-    factual_metrics['clustering_coefficient'] = nx.average_clustering(factual_undirected)
     
-    misinfo_largest_wcc = max(nx.weakly_connected_components(misinfo_graph), key=len)
-    factual_largest_wcc = max(nx.weakly_connected_components(factual_graph), key=len)
-    
-    misinfo_metrics['largest_component_size'] = len(misinfo_largest_wcc)
-    factual_metrics['largest_component_size'] = len(factual_largest_wcc)
-    
-    misinfo_metrics['largest_component_percentage'] = len(misinfo_largest_wcc) / misinfo_graph.number_of_nodes()
-    factual_metrics['largest_component_percentage'] = len(factual_largest_wcc) / factual_graph.number_of_nodes()
+    return misinfo_metrics, factual_metrics, misinfo_pagerank, factual_pagerank
+
+def louvain_partition(undirected):
+    if ig is None:
+        return community_louvain.best_partition(undirected)
     
-    try:
-        if len(misinfo_largest_wcc) < 1000:
-            misinfo_largest_graph = misinfo_graph.subgraph(misinfo_largest_wcc).copy()
-            misinfo_metrics['avg_path_length'] = nx.average_shortest_path_length(misinfo_largest_graph)
-        else:
-            sample_nodes = list(misinfo_largest_wcc)[:500]
-            misinfo_largest_graph = misinfo_graph.subgraph(sample_nodes).copy()
-            misinfo_metrics['avg_path_length'] = nx.average_shortest_path_length(misinfo_largest_graph)
-            misinfo_metrics['avg_path_length_note'] = 'Estimated from sample of 500 nodes'
-    except:
-        misinfo_metrics['avg_path_length'] = None
-        misinfo_metrics['avg_path_length_note'] = 'Could not compute'
-        
-    try:
-        if len(factual_largest_wcc) < 1000:
-            factual_largest_graph = factual_graph.subgraph(factual_largest_wcc).copy()
-            factual_metrics['avg_path_length'] = nx.average_shortest_path_length(factual_largest_graph)
-        else:
-            sample_nodes = list(factual_largest_wcc)[:500]
-            factual_largest_graph = factual_graph.subgraph(sample_nodes).copy()
-            factual_metrics['avg_path_length'] = nx.average_shortest_path_length(factual_largest_graph)
-            factual_metrics['avg_path_length_note'] = 'Estimated from sample of 500 nodes'
-    except:
-        factual_metrics['avg_path_length'] = None
-        factual_metrics['avg_path_length_note'] = 'Could not compute'
-        
-    return misinfo_metrics, factual_metrics
-
-def detect_communities(misinfo_graph, factual_graph):
+    nodelist = list(undirected)
+    index = {node: i for i, node in enumerate(nodelist)}
+    g = ig.Graph(n=len(nodelist), edges=[(index[u], index[v]) for u, v in undirected.edges()])
+    membership = g.community_multilevel().membership
+    return dict(zip(nodelist, membership))
+
+def detect_communities(misinfo_graph, factual_graph, misinfo_undirected=None, factual_undirected=None,
+                       parallel=False):
     print("Detecting communities using Louvain algorithm...")
     
-    misinfo_undirected = misinfo_graph.to_undirected()
-    factual_undirected = factual_graph.to_undirected()
-    
-    misinfo_communities = community_louvain.best_partition(misinfo_undirected)
-    factual_communities = community_louvain.best_partition(factual_undirected)
+    if misinfo_undirected is None:
+        misinfo_undirected = undirected_topology(misinfo_graph)
+    if factual_undirected is None:
+        factual_undirected = undirected_topology(factual_graph)
     
-    misinfo_community_sizes = {}
-    for node, community_id in misinfo_communities.items():
-        if community_id not in misinfo_community_sizes:
-            misinfo_community_sizes[community_id] = 0
-        misinfo_community_sizes[community_id] += 1
+    if parallel:
+        with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn')) as executor:
+            misinfo_future = executor.submit(louvain_partition, misinfo_undirected)
+            factual_future = executor.submit(louvain_partition, factual_undirected)
+            misinfo_communities = misinfo_future.result()
+            factual_communities = factual_future.result()
+    else:
+        misinfo_communities = louvain_partition(misinfo_undirected)
+        factual_communities = louvain_partition(factual_undirected)
     
-    factual_community_sizes = {}
-    for node, community_id in factual_communities.items():
-        if community_id not in factual_community_sizes:
-            factual_community_sizes[community_id] = 0
-        factual_community_sizes[community_id] += 1
+    misinfo_community_sizes = np.bincount(
+        np.fromiter(misinfo_communities.values(), dtype=np.int64, count=len(misinfo_communities))
+    )
+    factual_community_sizes = np.bincount(
+        np.fromiter(factual_communities.values(), dtype=np.int64, count=len(factual_communities))
+    )
     
     print(f"Misinformation communities: {len(misinfo_community_sizes)}")
     print(f"Factual communities: {len(factual_community_sizes)}")
     
-    misinfo_community_df = pd.DataFrame(misinfo_communities.items(), columns=['User', 'Community_ID'])
-    misinfo_community_df.to_csv('results/misinfo_communities.csv', index=False)
+    write_columns({
+        'User': np.fromiter(misinfo_communities.keys(), dtype=object, count=len(misinfo_communities)),
+        'Community_ID': np.fromiter(misinfo_communities.values(), dtype=np.int32, count=len(misinfo_communities))
+    }, 'results/misinfo_communities.csv')
     
-    factual_community_df = pd.DataFrame(factual_communities.items(), columns=['User', 'Community_ID'])
-    factual_community_df.to_csv('results/factual_communities.csv', index=False)
+    write_columns({
+        'User': np.fromiter(factual_communities.keys(), dtype=object, count=len(factual_communities)),
+        'Community_ID': np.fromiter(factual_communities.values(), dtype=np.int32, count=len(factual_communities))
+    }, 'results/factual_communities.csv')
     
-    misinfo_sizes_df = pd.DataFrame(misinfo_community_sizes.items(), columns=['Community_ID', 'Size'])
-    misinfo_sizes_df = misinfo_sizes_df.sort_values('Size', ascending=False)
-    misinfo_sizes_df.to_csv('results/misinfo_community_sizes.csv', index=False)
+    misinfo_sizes_df = pd.DataFrame({
+        'Community_ID': np.arange(len(misinfo_community_sizes)),
+        'Size': misinfo_community_sizes
+    }).sort_values('Size', ascending=False)
+    write_csv(misinfo_sizes_df, 'results/misinfo_community_sizes.csv')
     
-    factual_sizes_df = pd.DataFrame(factual_community_sizes.items(), columns=['Community_ID', 'Size'])
-    factual_sizes_df = factual_sizes_df.sort_values('Size', ascending=False)
-    factual_sizes_df.to_csv('results/factual_community_sizes.csv', index=False)
+    factual_sizes_df = pd.DataFrame({
+        'Community_ID': np.arange(len(factual_community_sizes)),
+        'Size': factual_community_sizes
+    }).sort_values('Size', ascending=False)
+    write_csv(factual_sizes_df, 'results/factual_community_sizes.csv')
     
     print("Community detection results saved to results directory")
     
@@ -0,0 +1,125 @@
+import numpy as np
+from numba import njit, prange
+
+@njit(cache=True, parallel=True)
+def pagerank_csr(indptr, indices, out_degree, x0, alpha, max_iter, tol):
+    # indptr/indices hold each node's in-links (CSR of the transposed adjacency)
+    N = out_degree.shape[0]
+    x = x0.copy()
+    x_new = np.empty_like(x0)
+
+    for _ in range(max_iter):
+        dangling_sum = 0.0
+        for i in range(N):
+            if out_degree[i] == 0:
+                dangling_sum += x[i]
+        base = alpha * dangling_sum / N + (1.0 - alpha) / N
+
+        err = 0.0
+        for j in prange(N):
+            total = 0.0
+            for p in range(indptr[j], indptr[j + 1]):
+                i = indices[p]
+                total += x[i] / out_degree[i]
+            x_new[j] = base + alpha * total
+            err += abs(x_new[j] - x[j])
+
+        x, x_new = x_new, x
+        if err < N * tol:
+            return x, True
+    return x, False
+
+@njit(cache=True)
+def pagerank_gs_csr(indptr, indices, out_degree, x0, alpha, max_iter, tol, refresh_every=50):
+    # Settled nodes are skipped except on every refresh_every-th sweep and the final check
+    N = out_degree.shape[0]
+    x = x0.copy()
+    x_prev = np.empty_like(x0)
+    active = np.ones(N, dtype=np.bool_)
+    skip_below = 0.01 * tol
+    teleport = (1.0 - alpha) / N
+
+    dangling_sum = 0.0
+    for i in range(N):
+        if out_degree[i] == 0:
+            dangling_sum += x[i]
+
+    confirm = False
+    for sweep in range(max_iter):
+        full = confirm or sweep % refresh_every == 0
+        x_prev[:] = x
+        for j in range(N):
+            if not full and not active[j]:
+                continue
+            total = 0.0
+            for p in range(indptr[j], indptr[j + 1]):
+                i = indices[p]
+                total += x[i] / out_degree[i]
+            new = teleport + alpha * (total + dangling_sum / N)
+            if out_degree[j] == 0:
+                dangling_sum += new - x[j]
+            x[j] = new
+
+        scale = x.sum()
+        x /= scale
+        dangling_sum /= scale
+
+        err = 0.0
+        for j in range(N):
+            delta = abs(x[j] - x_prev[j])
+            err += delta
+            active[j] = delta >= skip_below
+        if err < N * tol:
+            if full:
+                return x, True
+            confirm = True
+        else:
+            confirm = False
+    return x, False
+
+@njit(cache=True, parallel=True)
+def betweenness_csr(indptr, indices, in_indptr, in_indices, sources, n_chunks):
+    # Unnormalized Brandes dependencies over sources, one thread per chunk of sources
+    N = indptr.shape[0] - 1
+    n_sources = sources.shape[0]
+    partial = np.zeros((n_chunks, N))
+
+    for c in prange(n_chunks):
+        dist = np.empty(N, dtype=np.int64)
+        sigma = np.empty(N)
+        delta = np.empty(N)
+        order = np.empty(N, dtype=np.int64)
+
+        for k in range(c, n_sources, n_chunks):
+            s = sources[k]
+            dist[:] = -1
+            sigma[:] = 0.0
+            delta[:] = 0.0
+            dist[s] = 0
+            sigma[s] = 1.0
+            order[0] = s
+            head = 0
+            tail = 1
+
+            while head < tail:
+                v = order[head]
+                head += 1
+                for p in range(indptr[v], indptr[v + 1]):
+                    w = indices[p]
+                    if dist[w] < 0:
+                        dist[w] = dist[v] + 1
+                        order[tail] = w
+                        tail += 1
+                    if dist[w] == dist[v] + 1:
+                        sigma[w] += sigma[v]
+
+            for q in range(tail - 1, 0, -1):
+                w = order[q]
+                coefficient = (1.0 + delta[w]) / sigma[w]
+                for p in range(in_indptr[w], in_indptr[w + 1]):
+                    v = in_indices[p]
+                    if dist[v] == dist[w] - 1:
+                        delta[v] += sigma[v] * coefficient
+                partial[c, w] += delta[w]
+
+    return partial.sum(axis=0)
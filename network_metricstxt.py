@@ -12,16 +12,56 @@ import networkx as nx
 import numpy as np
 import os
 import time
+from scipy.sparse.csgraph import connected_components
+from csv_utils import DELETED_AUTHOR, fill_missing, read_csv
+from network_metrics import (
+    pagerank_gauss_seidel,
+    betweenness_centrality_approx,
+    adjacency_csr,
+    average_path_length_sampled,
+    average_clustering_sparse,
+    density_csr
+)
 
 # Define paths to the saved network data
 MISINFO_EDGES_PATH = 'reddit_data/network_edges_misinformation_20250408_140600.csv'
 FACTUAL_EDGES_PATH = 'reddit_data/network_edges_factual_20250408_141247.csv'
 
+EDGE_COLUMNS = ['source', 'target', 'subreddit', 'category', 'created_utc']
+EDGE_CATEGORICAL = ['source', 'target', 'subreddit', 'category']
+
+def score_arrays(scores):
+    nodes = np.array(list(scores), dtype=object)
+    values = np.fromiter(scores.values(), dtype=np.float64, count=len(nodes))
+    return nodes, values
+
+def top_k_indices(values, k=10):
+    k = min(k, len(values))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    top = np.argpartition(-values, k - 1)[:k]
+    return top[np.argsort(-values[top], kind='stable')]
+
+def in_degree_nstart(adjacency):
+    A, nodelist = adjacency
+    weights = np.bincount(A.indices, minlength=A.shape[0]) + 1.0
+    return dict(zip(nodelist, (weights / weights.sum()).tolist()))
+
+def subreddit_edge_counts(edges, graph):
+    if edges is None:
+        edges = pd.DataFrame(list(graph.edges(data='subreddit')), columns=['source', 'target', 'subreddit'])
+    else:
+        edges = edges.drop_duplicates(['source', 'target'], keep='last')
+    counts = edges.groupby('subreddit', observed=True, dropna=False).size()
+    return counts.sort_values(ascending=False, kind='stable')
+
 def load_networks():
     print("Loading network edge data...")
     
-    misinfo_edges = pd.read_csv(MISINFO_EDGES_PATH)
-    factual_edges = pd.read_csv(FACTUAL_EDGES_PATH)
+    misinfo_edges = read_csv(MISINFO_EDGES_PATH, EDGE_COLUMNS, EDGE_CATEGORICAL)
+    factual_edges = read_csv(FACTUAL_EDGES_PATH, EDGE_COLUMNS, EDGE_CATEGORICAL)
+    for edges in (misinfo_edges, factual_edges):
+        fill_missing(edges, ['source', 'target'], DELETED_AUTHOR)
     
     print("Building networks...")
     
@@ -54,246 +94,258 @@ def load_networks():
     print(f"Factual network: {factual_graph.number_of_nodes()} nodes, {factual_graph.number_of_edges()} edges")
     print(f"Combined network: {combined_graph.number_of_nodes()} nodes, {combined_graph.number_of_edges()} edges")
     
-    return misinfo_graph, factual_graph, combined_graph
+    misinfo_adjacency = adjacency_csr(misinfo_graph)
+    factual_adjacency = adjacency_csr(factual_graph)
+    
+    return misinfo_graph, factual_graph, combined_graph, misinfo_adjacency, factual_adjacency, misinfo_edges, factual_edges
 
-def generate_network_metrics_report(misinfo_graph, factual_graph, combined_graph, output_path="results/network_metrics_report.txt"):
+def generate_network_metrics_report(misinfo_graph, factual_graph, combined_graph, output_path="results/network_metrics_report.txt",
+                                    misinfo_adjacency=None, factual_adjacency=None, misinfo_edges=None, factual_edges=None):
     start_time = time.time()
     print("Generating network metrics report...")
     
-    with open(output_path, 'w') as f:
-        f.write("=====================================================\n")
-        f.write("COVID-19 MISINFORMATION NETWORK ANALYSIS - METRICS REPORT\n")
-        f.write("=====================================================\n\n")
-        
-        f.write(f"Report generated on: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        
-        f.write("1. BASIC NETWORK STATISTICS\n")
-        f.write("---------------------------\n\n")
-        
-        f.write("Misinformation Network:\n")
-        f.write(f"  - Nodes: {misinfo_graph.number_of_nodes()}\n")
-        f.write(f"  - Edges: {misinfo_graph.number_of_edges()}\n")
-        f.write(f"  - Density: {nx.density(misinfo_graph):.6f}\n")
-        
-        misinfo_degrees = [d for n, d in misinfo_graph.degree()]
-        f.write(f"  - Average Degree: {np.mean(misinfo_degrees):.2f}\n")
-        f.write(f"  - Median Degree: {np.median(misinfo_degrees):.2f}\n")
-        f.write(f"  - Max Degree: {np.max(misinfo_degrees)}\n")
-        
-        misinfo_in_degrees = [d for n, d in misinfo_graph.in_degree()]
-        misinfo_out_degrees = [d for n, d in misinfo_graph.out_degree()]
-        f.write(f"  - Average In-Degree: {np.mean(misinfo_in_degrees):.2f}\n")
-        f.write(f"  - Average Out-Degree: {np.mean(misinfo_out_degrees):.2f}\n")
-        
-        f.write("\nFactual Information Network:\n")
-        f.write(f"  - Nodes: {factual_graph.number_of_nodes()}\n")
-        f.write(f"  - Edges: {factual_graph.number_of_edges()}\n")
-        f.write(f"  - Density: {nx.density(factual_graph):.6f}\n")
-        
-        factual_degrees = [d for n, d in factual_graph.degree()]
-        f.write(f"  - Average Degree: {np.mean(factual_degrees):.2f}\n")
-        f.write(f"  - Median Degree: {np.median(factual_degrees):.2f}\n")
-        f.write(f"  - Max Degree: {np.max(factual_degrees)}\n")
-        
-        factual_in_degrees = [d for n, d in factual_graph.in_degree()]
-        factual_out_degrees = [d for n, d in factual_graph.out_degree()]
-        f.write(f"  - Average In-Degree: {np.mean(factual_in_degrees):.2f}\n")
-        f.write(f"  - Average Out-Degree: {np.mean(factual_out_degrees):.2f}\n")
-        
-        f.write("\nCombined Network:\n")
-        f.write(f"  - Nodes: {combined_graph.number_of_nodes()}\n")
-        f.write(f"  - Edges: {combined_graph.number_of_edges()}\n")
-        f.write(f"  - Density: {nx.density(combined_graph):.6f}\n\n")
-        
-        f.write("2. CENTRALIZATION METRICS\n")
-        f.write("-------------------------\n\n")
-        
-        f.write("PageRank Statistics:\n")
-        print("  Calculating PageRank...")
-        misinfo_pagerank = nx.pagerank(misinfo_graph, max_iter=100)
-        factual_pagerank = nx.pagerank(factual_graph, max_iter=100)
-        
-        f.write("  Misinformation Network:\n")
-        f.write(f"    - Max PageRank: {max(misinfo_pagerank.values()):.6f}\n")
-        f.write(f"    - Average PageRank: {np.mean(list(misinfo_pagerank.values())):.6f}\n")
-        f.write("    - Top 10 Users by PageRank:\n")
-        
-        for i, (user, pr) in enumerate(sorted(misinfo_pagerank.items(), key=lambda x: x[1], reverse=True)[:10], 1):
-            f.write(f"      {i}. {user}: {pr:.6f}\n")
-        
-        f.write("\n  Factual Information Network:\n")
-        f.write(f"    - Max PageRank: {max(factual_pagerank.values()):.6f}\n")
-        f.write(f"    - Average PageRank: {np.mean(list(factual_pagerank.values())):.6f}\n")
-        f.write("    - Top 10 Users by PageRank:\n")
-        
-        for i, (user, pr) in enumerate(sorted(factual_pagerank.items(), key=lambda x: x[1], reverse=True)[:10], 1):
-            f.write(f"      {i}. {user}: {pr:.6f}\n")
-        
-        f.write("\n")
-        
-        f.write("Approximate Betweenness Centrality:\n")
-        print("  Calculating approximate betweenness centrality (this may take a while)...")
-        
-        try:
-            misinfo_betweenness = nx.betweenness_centrality(misinfo_graph, k=500, normalized=True)
-            factual_betweenness = nx.betweenness_centrality(factual_graph, k=500, normalized=True)
-            
-            f.write("  Misinformation Network:\n")
-            f.write(f"    - Max Betweenness: {max(misinfo_betweenness.values()):.6f}\n")
-            f.write(f"    - Average Betweenness: {np.mean(list(misinfo_betweenness.values())):.6f}\n")
-            f.write("    - Top 10 Users by Betweenness:\n")
-            
-            for i, (user, bc) in enumerate(sorted(misinfo_betweenness.items(), key=lambda x: x[1], reverse=True)[:10], 1):
-                f.write(f"      {i}. {user}: {bc:.6f}\n")
-            
-            f.write("\n  Factual Information Network:\n")
-            f.write(f"    - Max Betweenness: {max(factual_betweenness.values()):.6f}\n")
-            f.write(f"    - Average Betweenness: {np.mean(list(factual_betweenness.values())):.6f}\n")
-            f.write("    - Top 10 Users by Betweenness:\n")
-            
-            for i, (user, bc) in enumerate(sorted(factual_betweenness.items(), key=lambda x: x[1], reverse=True)[:10], 1):
-                f.write(f"      {i}. {user}: {bc:.6f}\n")
-        except Exception as e:
-            f.write(f"  Could not compute betweenness centrality due to: {e}\n")
-        
-        f.write("\n")
+    if misinfo_adjacency is None:
+        misinfo_adjacency = adjacency_csr(misinfo_graph)
+    if factual_adjacency is None:
+        factual_adjacency = adjacency_csr(factual_graph)
+    
+    misinfo_A = misinfo_adjacency[0]
+    factual_A = factual_adjacency[0]
+    misinfo_N, misinfo_E = misinfo_A.shape[0], misinfo_A.nnz
+    factual_N, factual_E = factual_A.shape[0], factual_A.nnz
+    combined_N, combined_E = combined_graph.number_of_nodes(), combined_graph.number_of_edges()
+    
+    parts = []
+    write = parts.append
+    
+    write("=====================================================\n")
+    write("COVID-19 MISINFORMATION NETWORK ANALYSIS - METRICS REPORT\n")
+    write("=====================================================\n\n")
+    
+    write(f"Report generated on: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+    
+    write("1. BASIC NETWORK STATISTICS\n")
+    write("---------------------------\n\n")
+    
+    write("Misinformation Network:\n")
+    write(f"  - Nodes: {misinfo_N}\n")
+    write(f"  - Edges: {misinfo_E}\n")
+    write(f"  - Density: {density_csr(misinfo_A):.6f}\n")
+    
+    misinfo_out_degrees = np.diff(misinfo_A.indptr)
+    misinfo_in_degrees = np.bincount(misinfo_A.indices, minlength=misinfo_N)
+    misinfo_degrees = misinfo_out_degrees + misinfo_in_degrees
+    write(f"  - Average Degree: {np.mean(misinfo_degrees):.2f}\n")
+    write(f"  - Median Degree: {np.median(misinfo_degrees):.2f}\n")
+    write(f"  - Max Degree: {misinfo_degrees.max()}\n")
+    
+    write(f"  - Average In-Degree: {np.mean(misinfo_in_degrees):.2f}\n")
+    write(f"  - Average Out-Degree: {np.mean(misinfo_out_degrees):.2f}\n")
+    
+    write("\nFactual Information Network:\n")
+    write(f"  - Nodes: {factual_N}\n")
+    write(f"  - Edges: {factual_E}\n")
+    write(f"  - Density: {density_csr(factual_A):.6f}\n")
+    
+    factual_out_degrees = np.diff(factual_A.indptr)
+    factual_in_degrees = np.bincount(factual_A.indices, minlength=factual_N)
+    factual_degrees = factual_out_degrees + factual_in_degrees
+    write(f"  - Average Degree: {np.mean(factual_degrees):.2f}\n")
+    write(f"  - Median Degree: {np.median(factual_degrees):.2f}\n")
+    write(f"  - Max Degree: {factual_degrees.max()}\n")
+    
+    write(f"  - Average In-Degree: {np.mean(factual_in_degrees):.2f}\n")
+    write(f"  - Average Out-Degree: {np.mean(factual_out_degrees):.2f}\n")
+    
+    write("\nCombined Network:\n")
+    write(f"  - Nodes: {combined_N}\n")
+    write(f"  - Edges: {combined_E}\n")
+    write(f"  - Density: {combined_E / (combined_N * (combined_N - 1)) if combined_N > 1 else 0:.6f}\n\n")
+    
+    write("2. CENTRALIZATION METRICS\n")
+    write("-------------------------\n\n")
+    
+    write("PageRank Statistics:\n")
+    print("  Calculating PageRank...")
+    misinfo_pagerank = pagerank_gauss_seidel(
+        misinfo_graph, alpha=0.85, max_iter=100, tol=1e-6,
+        nstart=in_degree_nstart(misinfo_adjacency), adjacency=misinfo_adjacency
+    )
+    factual_pagerank = pagerank_gauss_seidel(
+        factual_graph, alpha=0.85, max_iter=100, tol=1e-6,
+        nstart=in_degree_nstart(factual_adjacency), adjacency=factual_adjacency
+    )
+    
+    write("  Misinformation Network:\n")
+    misinfo_pr_nodes, misinfo_pr_values = score_arrays(misinfo_pagerank)
+    write(f"    - Max PageRank: {misinfo_pr_values.max():.6f}\n")
+    write(f"    - Average PageRank: {misinfo_pr_values.mean():.6f}\n")
+    write("    - Top 10 Users by PageRank:\n")
+    
+    misinfo_pr_top = top_k_indices(misinfo_pr_values)
+    for i, (user, pr) in enumerate(zip(misinfo_pr_nodes[misinfo_pr_top], misinfo_pr_values[misinfo_pr_top]), 1):
+        write(f"      {i}. {user}: {pr:.6f}\n")
+    
+    write("\n  Factual Information Network:\n")
+    factual_pr_nodes, factual_pr_values = score_arrays(factual_pagerank)
+    write(f"    - Max PageRank: {factual_pr_values.max():.6f}\n")
+    write(f"    - Average PageRank: {factual_pr_values.mean():.6f}\n")
+    write("    - Top 10 Users by PageRank:\n")
+    
+    factual_pr_top = top_k_indices(factual_pr_values)
+    for i, (user, pr) in enumerate(zip(factual_pr_nodes[factual_pr_top], factual_pr_values[factual_pr_top]), 1):
+        write(f"      {i}. {user}: {pr:.6f}\n")
+    
+    write("\n")
+    
+    write("Approximate Betweenness Centrality:\n")
+    print("  Calculating approximate betweenness centrality (this may take a while)...")
+    
+    try:
+        misinfo_betweenness = betweenness_centrality_approx(misinfo_graph, k=500, adjacency=misinfo_adjacency)
+        factual_betweenness = betweenness_centrality_approx(factual_graph, k=500, adjacency=factual_adjacency)
+        
+        write("  Misinformation Network:\n")
+        misinfo_bc_nodes, misinfo_bc_values = score_arrays(misinfo_betweenness)
+        write(f"    - Max Betweenness: {misinfo_bc_values.max():.6f}\n")
+        write(f"    - Average Betweenness: {misinfo_bc_values.mean():.6f}\n")
+        write("    - Top 10 Users by Betweenness:\n")
+        
+        misinfo_bc_top = top_k_indices(misinfo_bc_values)
+        for i, (user, bc) in enumerate(zip(misinfo_bc_nodes[misinfo_bc_top], misinfo_bc_values[misinfo_bc_top]), 1):
+            write(f"      {i}. {user}: {bc:.6f}\n")
+        
+        write("\n  Factual Information Network:\n")
+        factual_bc_nodes, factual_bc_values = score_arrays(factual_betweenness)
+        write(f"    - Max Betweenness: {factual_bc_values.max():.6f}\n")
+        write(f"    - Average Betweenness: {factual_bc_values.mean():.6f}\n")
+        write("    - Top 10 Users by Betweenness:\n")
+        
+        factual_bc_top = top_k_indices(factual_bc_values)
+        for i, (user, bc) in enumerate(zip(factual_bc_nodes[factual_bc_top], factual_bc_values[factual_bc_top]), 1):
+            write(f"      {i}. {user}: {bc:.6f}\n")
+    except Exception as e:
+        write(f"  Could not compute betweenness centrality due to: {e}\n")
+    
+    write("\n")
 
-        f.write("3. CONNECTED COMPONENTS\n")
-        f.write("-----------------------\n\n")
-        print("  Analyzing connected components...")
-        
-        misinfo_wcc = list(nx.weakly_connected_components(misinfo_graph))
-        factual_wcc = list(nx.weakly_connected_components(factual_graph))
-        
-        f.write("Misinformation Network:\n")
-        f.write(f"  - Number of weakly connected components: {len(misinfo_wcc)}\n")
-        f.write(f"  - Size of largest component: {len(max(misinfo_wcc, key=len))}\n")
-        f.write(f"  - Percentage of nodes in largest component: {len(max(misinfo_wcc, key=len)) / misinfo_graph.number_of_nodes():.2%}\n")
-        
-        misinfo_cc_sizes = [len(cc) for cc in misinfo_wcc]
-        f.write("  - Component size distribution:\n")
-        f.write(f"    * Min: {min(misinfo_cc_sizes)}\n")
-        f.write(f"    * 25th percentile: {np.percentile(misinfo_cc_sizes, 25):.1f}\n")
-        f.write(f"    * Median: {np.median(misinfo_cc_sizes):.1f}\n")
-        f.write(f"    * 75th percentile: {np.percentile(misinfo_cc_sizes, 75):.1f}\n")
-        f.write(f"    * Max: {max(misinfo_cc_sizes)}\n")
-        
-        f.write("\nFactual Information Network:\n")
-        f.write(f"  - Number of weakly connected components: {len(factual_wcc)}\n")
-        f.write(f"  - Size of largest component: {len(max(factual_wcc, key=len))}\n")
-        f.write(f"  - Percentage of nodes in largest component: {len(max(factual_wcc, key=len)) / factual_graph.number_of_nodes():.2%}\n")
-        
-        factual_cc_sizes = [len(cc) for cc in factual_wcc]
-        f.write("  - Component size distribution:\n")
-        f.write(f"    * Min: {min(factual_cc_sizes)}\n")
-        f.write(f"    * 25th percentile: {np.percentile(factual_cc_sizes, 25):.1f}\n")
-        f.write(f"    * Median: {np.median(factual_cc_sizes):.1f}\n")
-        f.write(f"    * 75th percentile: {np.percentile(factual_cc_sizes, 75):.1f}\n")
-        f.write(f"    * Max: {max(factual_cc_sizes)}\n\n")
-        
-        f.write("4. CLUSTERING METRICS\n")
-        f.write("---------------------\n\n")
-        print("  Calculating clustering coefficients...")
-        
-        misinfo_undirected = misinfo_graph.to_undirected()
-        factual_undirected = factual_graph.to_undirected()
-        
-        f.write("Misinformation Network:\n")
-        f.write(f"  - Average clustering coefficient: {nx.average_clustering(misinfo_undirected):.6f}\n")
-        
-        f.write("\nFactual Information Network:\n")
-        f.write(f"  - Average clustering coefficient: {nx.average_clustering(factual_undirected):.6f}\n\n")
-        
-        f.write("5. PATH LENGTH ANALYSIS\n")
-        f.write("----------------------\n\n")
-        print("  Analyzing path lengths...")
-        
-        misinfo_largest_cc = max(nx.weakly_connected_components(misinfo_graph), key=len)
-        factual_largest_cc = max(nx.weakly_connected_components(factual_graph), key=len)
-        
-        try:
-            if len(misinfo_largest_cc) > 1000:
-                misinfo_sample = list(misinfo_largest_cc)[:500]
-                misinfo_sample_graph = misinfo_graph.subgraph(misinfo_sample).copy()
-                avg_path_length_misinfo = nx.average_shortest_path_length(misinfo_sample_graph)
-                f.write(f"Misinformation Network (sampled 500 nodes): {avg_path_length_misinfo:.4f}\n")
-            else:
-                misinfo_largest_graph = misinfo_graph.subgraph(misinfo_largest_cc).copy()
-                avg_path_length_misinfo = nx.average_shortest_path_length(misinfo_largest_graph)
-                f.write(f"Misinformation Network: {avg_path_length_misinfo:.4f}\n")
-        except Exception as e:
-            f.write(f"Could not compute average path length for misinformation network: {e}\n")
-            
-        try:
-            if len(factual_largest_cc) > 1000:
-                factual_sample = list(factual_largest_cc)[:500]
-                factual_sample_graph = factual_graph.subgraph(factual_sample).copy()
-                avg_path_length_factual = nx.average_shortest_path_length(factual_sample_graph)
-                f.write(f"Factual Network (sampled 500 nodes): {avg_path_length_factual:.4f}\n\n")
-            else:
-                factual_largest_graph = factual_graph.subgraph(factual_largest_cc).copy()
-                avg_path_length_factual = nx.average_shortest_path_length(factual_largest_graph)
-                f.write(f"Factual Network: {avg_path_length_factual:.4f}\n\n")
-        except Exception as e:
-            f.write(f"Could not compute average path length for factual network: {e}\n\n")
-        
-        f.write("6. CROSS-POSTING ANALYSIS\n")
-        f.write("-------------------------\n\n")
-        print("  Analyzing cross-posting behavior...")
-        
-        crossposters = set(misinfo_graph.nodes()).intersection(set(factual_graph.nodes()))
-        
-        f.write(f"Number of cross-posting users: {len(crossposters)}\n")
-        f.write(f"Percentage of all users: {len(crossposters) / combined_graph.number_of_nodes():.2%}\n\n")
-        
-        f.write("Top 10 cross-posters by combined influence (PageRank):\n")
-        
-        crossposter_data = []
-        for user in crossposters:
-            crossposter_data.append({
-                'user': user,
-                'misinfo_pagerank': misinfo_pagerank.get(user, 0),
-                'factual_pagerank': factual_pagerank.get(user, 0),
-                'total_pagerank': misinfo_pagerank.get(user, 0) + factual_pagerank.get(user, 0)
-            })
-        
-        if crossposter_data:
-            sorted_crossposters = sorted(crossposter_data, key=lambda x: x['total_pagerank'], reverse=True)[:10]
-            
-            for i, data in enumerate(sorted_crossposters, 1):
-                f.write(f"  {i}. {data['user']}:\n")
-                f.write(f"     - Misinformation PageRank: {data['misinfo_pagerank']:.6f}\n")
-                f.write(f"     - Factual PageRank: {data['factual_pagerank']:.6f}\n")
-                f.write(f"     - Total PageRank: {data['total_pagerank']:.6f}\n")
-                
-                misinfo_proportion = data['misinfo_pagerank'] / data['total_pagerank'] if data['total_pagerank'] > 0 else 0
-                f.write(f"     - Proportion of influence in misinformation network: {misinfo_proportion:.2%}\n\n")
-                
-        f.write("7. SUBREDDIT PARTICIPATION ANALYSIS\n")
-        f.write("----------------------------------\n\n")
-        
-        misinfo_subreddit_counts = {}
-        for _, _, attrs in misinfo_graph.edges(data=True):
-            if 'subreddit' in attrs:
-                subreddit = attrs['subreddit']
-                misinfo_subreddit_counts[subreddit] = misinfo_subreddit_counts.get(subreddit, 0) + 1
-                
-        factual_subreddit_counts = {}
-        for _, _, attrs in factual_graph.edges(data=True):
-            if 'subreddit' in attrs:
-                subreddit = attrs['subreddit']
-                factual_subreddit_counts[subreddit] = factual_subreddit_counts.get(subreddit, 0) + 1
-        
-        f.write("Misinformation Subreddits Participation:\n")
-        for subreddit, count in sorted(misinfo_subreddit_counts.items(), key=lambda x: x[1], reverse=True):
-            f.write(f"  - r/{subreddit}: {count} interactions\n")
+    write("3. CONNECTED COMPONENTS\n")
+    write("-----------------------\n\n")
+    print("  Analyzing connected components...")
+    
+    _, misinfo_labels = connected_components(misinfo_A, directed=True, connection='weak')
+    _, factual_labels = connected_components(factual_A, directed=True, connection='weak')
+    misinfo_cc_sizes = np.bincount(misinfo_labels)
+    factual_cc_sizes = np.bincount(factual_labels)
+    
+    write("Misinformation Network:\n")
+    write(f"  - Number of weakly connected components: {len(misinfo_cc_sizes)}\n")
+    write(f"  - Size of largest component: {misinfo_cc_sizes.max()}\n")
+    write(f"  - Percentage of nodes in largest component: {misinfo_cc_sizes.max() / misinfo_N:.2%}\n")
+    
+    write("  - Component size distribution:\n")
+    write(f"    * Min: {misinfo_cc_sizes.min()}\n")
+    write(f"    * 25th percentile: {np.percentile(misinfo_cc_sizes, 25):.1f}\n")
+    write(f"    * Median: {np.median(misinfo_cc_sizes):.1f}\n")
+    write(f"    * 75th percentile: {np.percentile(misinfo_cc_sizes, 75):.1f}\n")
+    write(f"    * Max: {misinfo_cc_sizes.max()}\n")
+    
+    write("\nFactual Information Network:\n")
+    write(f"  - Number of weakly connected components: {len(factual_cc_sizes)}\n")
+    write(f"  - Size of largest component: {factual_cc_sizes.max()}\n")
+    write(f"  - Percentage of nodes in largest component: {factual_cc_sizes.max() / factual_N:.2%}\n")
+    
+    write("  - Component size distribution:\n")
+    write(f"    * Min: {factual_cc_sizes.min()}\n")
+    write(f"    * 25th percentile: {np.percentile(factual_cc_sizes, 25):.1f}\n")
+    write(f"    * Median: {np.median(factual_cc_sizes):.1f}\n")
+    write(f"    * 75th percentile: {np.percentile(factual_cc_sizes, 75):.1f}\n")
+    write(f"    * Max: {factual_cc_sizes.max()}\n\n")
+    
+    write("4. CLUSTERING METRICS\n")
+    write("---------------------\n\n")
+    print("  Calculating clustering coefficients...")
+    
+    write("Misinformation Network:\n")
+    write(f"  - Average clustering coefficient: {average_clustering_sparse(misinfo_A):.6f}\n")
+    
+    write("\nFactual Information Network:\n")
+    write(f"  - Average clustering coefficient: {average_clustering_sparse(factual_A):.6f}\n\n")
+    
+    write("5. PATH LENGTH ANALYSIS\n")
+    write("----------------------\n\n")
+    print("  Analyzing path lengths...")
+    
+    misinfo_largest_idx = np.flatnonzero(misinfo_labels == misinfo_cc_sizes.argmax())
+    factual_largest_idx = np.flatnonzero(factual_labels == factual_cc_sizes.argmax())
+    
+    try:
+        avg_path_length_misinfo, exact = average_path_length_sampled(misinfo_A, misinfo_largest_idx, n_sources=500)
+        if exact:
+            write(f"Misinformation Network (undirected): {avg_path_length_misinfo:.4f}\n")
+        else:
+            write(f"Misinformation Network (undirected, BFS from 500 sampled nodes): {avg_path_length_misinfo:.4f}\n")
+    except Exception as e:
+        write(f"Could not compute average path length for misinformation network: {e}\n")
+        
+    try:
+        avg_path_length_factual, exact = average_path_length_sampled(factual_A, factual_largest_idx, n_sources=500)
+        if exact:
+            write(f"Factual Network (undirected): {avg_path_length_factual:.4f}\n\n")
+        else:
+            write(f"Factual Network (undirected, BFS from 500 sampled nodes): {avg_path_length_factual:.4f}\n\n")
+    except Exception as e:
+        write(f"Could not compute average path length for factual network: {e}\n\n")
+    
+    write("6. CROSS-POSTING ANALYSIS\n")
+    write("-------------------------\n\n")
+    print("  Analyzing cross-posting behavior...")
+    
+    crossposters = set(misinfo_graph.nodes()).intersection(set(factual_graph.nodes()))
+    
+    write(f"Number of cross-posting users: {len(crossposters)}\n")
+    write(f"Percentage of all users: {len(crossposters) / combined_N:.2%}\n\n")
+    
+    write("Top 10 cross-posters by combined influence (PageRank):\n")
+    
+    crossposter_users = np.array(list(crossposters), dtype=object)
+    crossposter_misinfo_pr = np.fromiter(
+        (misinfo_pagerank.get(user, 0) for user in crossposter_users), dtype=np.float64, count=len(crossposter_users)
+    )
+    crossposter_factual_pr = np.fromiter(
+        (factual_pagerank.get(user, 0) for user in crossposter_users), dtype=np.float64, count=len(crossposter_users)
+    )
+    crossposter_total_pr = crossposter_misinfo_pr + crossposter_factual_pr
+    
+    for i, j in enumerate(top_k_indices(crossposter_total_pr), 1):
+        total_pr = crossposter_total_pr[j]
+        write(f"  {i}. {crossposter_users[j]}:\n")
+        write(f"     - Misinformation PageRank: {crossposter_misinfo_pr[j]:.6f}\n")
+        write(f"     - Factual PageRank: {crossposter_factual_pr[j]:.6f}\n")
+        write(f"     - Total PageRank: {total_pr:.6f}\n")
+        
+        misinfo_proportion = crossposter_misinfo_pr[j] / total_pr if total_pr > 0 else 0
+        write(f"     - Proportion of influence in misinformation network: {misinfo_proportion:.2%}\n\n")
             
-        f.write("\nFactual Subreddits Participation:\n")
-        for subreddit, count in sorted(factual_subreddit_counts.items(), key=lambda x: x[1], reverse=True):
-            f.write(f"  - r/{subreddit}: {count} interactions\n")
+    write("7. SUBREDDIT PARTICIPATION ANALYSIS\n")
+    write("----------------------------------\n\n")
+    
+    misinfo_subreddit_counts = subreddit_edge_counts(misinfo_edges, misinfo_graph)
+    factual_subreddit_counts = subreddit_edge_counts(factual_edges, factual_graph)
+    
+    write("Misinformation Subreddits Participation:\n")
+    for subreddit, count in misinfo_subreddit_counts.items():
+        write(f"  - r/{subreddit}: {count} interactions\n")
         
-        end_time = time.time()
-        f.write(f"\nReport generation completed in {end_time - start_time:.2f} seconds.\n")
+    write("\nFactual Subreddits Participation:\n")
+    for subreddit, count in factual_subreddit_counts.items():
+        write(f"  - r/{subreddit}: {count} interactions\n")
+    
+    end_time = time.time()
+    write(f"\nReport generation completed in {end_time - start_time:.2f} seconds.\n")
+    
+    with open(output_path, 'w') as f:
+        f.write("".join(parts))
     
     print(f"Network metrics report saved to {output_path}")
     return output_path
@@ -304,9 +356,14 @@ def main():
     
     os.makedirs("results", exist_ok=True)
     
-    misinfo_graph, factual_graph, combined_graph = load_networks()
+    (misinfo_graph, factual_graph, combined_graph,
+     misinfo_adjacency, factual_adjacency, misinfo_edges, factual_edges) = load_networks()
     
-    report_path = generate_network_metrics_report(misinfo_graph, factual_graph, combined_graph)
+    report_path = generate_network_metrics_report(
+        misinfo_graph, factual_graph, combined_graph,
+        misinfo_adjacency=misinfo_adjacency, factual_adjacency=factual_adjacency,
+        misinfo_edges=misinfo_edges, factual_edges=factual_edges
+    )
     
     end_time = time.time()
     print(f"Total execution time: {end_time - start_time:.2f} seconds")
@@ -1,14 +1,23 @@
-import praw
-import pandas as pd
+import asyncio
+import asyncpraw
+import csv
 import datetime
-import time
 import os
+import re
 
-reddit = praw.Reddit(
-    client_id="ID_GOES_HERE",
-    client_secret="SECRET_GOES_HERE",
-    user_agent="script:misinformation_analysis:v1.0 (by u/YOUR_USER_NAME)"
-)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+def create_reddit():
+    return asyncpraw.Reddit(
+        client_id="ID_GOES_HERE",
+        client_secret="SECRET_GOES_HERE",
+        user_agent="script:misinformation_analysis:v1.0 (by u/YOUR_USER_NAME)"
+    )
+
+MAX_CONCURRENT_SUBREDDITS = 4
 
 misinformation_subreddits = [
     "NoNewNormal", "Conspiracy", "DebateVaccines",
@@ -27,25 +36,43 @@ covid_keywords = [
     "lockdown", "mandate", "jab", "fauci", "cdc", "who", "masks"
 ]
 
+if ahocorasick is not None:
+    covid_keyword_automaton = ahocorasick.Automaton()
+    for keyword in covid_keywords:
+        covid_keyword_automaton.add_word(keyword, keyword)
+    covid_keyword_automaton.make_automaton()
+else:
+    covid_keyword_pattern = re.compile("|".join(re.escape(keyword) for keyword in covid_keywords))
+
 def is_covid_related(text):
     if not text:
         return False
     
     text = text.lower()
-    return any(keyword in text for keyword in covid_keywords)
+    if ahocorasick is not None:
+        return next(covid_keyword_automaton.iter(text), None) is not None
+    return covid_keyword_pattern.search(text) is not None
 
-def collect_reddit_data(subreddits, category, limit=100):
-    all_posts = []
-    all_comments = []
-    all_users = set()
+def write_rows_csv(rows, filename, fieldnames=None):
+    if fieldnames is None:
+        fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+    with open(filename, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+
+async def collect_subreddit(reddit, subreddit_name, category, limit, semaphore):
+    posts = []
+    comments = []
+    users = set()
     
-    for subreddit_name in subreddits:
+    async with semaphore:
         print(f"Collecting from r/{subreddit_name}...")
         
         try:
-            subreddit = reddit.subreddit(subreddit_name)
+            subreddit = await reddit.subreddit(subreddit_name)
             
-            for submission in subreddit.search("covid OR vaccine", sort="top", time_filter="year", limit=limit):
+            async for submission in subreddit.search("covid OR vaccine", sort="top", time_filter="year", limit=limit):
                 post_data = {
                     'id': submission.id,
                     'type': 'submission',
@@ -63,16 +90,19 @@ def collect_reddit_data(subreddits, category, limit=100):
                     'subreddit': subreddit_name,
                     'category': category
                 }
-                all_posts.append(post_data)
+                posts.append(post_data)
                 
                 if submission.author:
-                    all_users.add(str(submission.author))
+                    users.add(str(submission.author))
                 
-                submission.comments.replace_more(limit=0)
+                await submission.load()
+                await submission.comments.replace_more(limit=0)
                 
-                def process_comments(comment, level=0):
+                stack = [(comment, 0) for comment in reversed(list(submission.comments))]
+                while stack:
+                    comment, level = stack.pop()
                     if not comment.author:
-                        return
+                        continue
                     
                     comment_data = {
                         'id': comment.id,
@@ -89,15 +119,11 @@ def collect_reddit_data(subreddits, category, limit=100):
                         'category': category,
                         'comment_level': level
                     }
-                    all_comments.append(comment_data)
+                    comments.append(comment_data)
                     
-                    all_users.add(str(comment.author))
+                    users.add(str(comment.author))
                     
-                    for reply in comment.replies:
-                        process_comments(reply, level+1)
-                
-                for comment in submission.comments:
-                    process_comments(comment)
+                    stack.extend((reply, level + 1) for reply in reversed(list(comment.replies)))
                 
                 print(f"  Processed submission '{submission.title[:30]}...' with {submission.num_comments} comments")
             
@@ -110,52 +136,64 @@ def collect_reddit_data(subreddits, category, limit=100):
         
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        if all_posts:
-            posts_df = pd.DataFrame(all_posts)
+        if posts:
             posts_filename = f"reddit_data/posts_{subreddit_name}_{timestamp}.csv"
-            posts_df.to_csv(posts_filename, index=False)
-            print(f"Saved {len(all_posts)} posts to {posts_filename}")
+            write_rows_csv(posts, posts_filename)
+            print(f"Saved {len(posts)} posts to {posts_filename}")
         
-        if all_comments:
-            comments_df = pd.DataFrame(all_comments)
+        if comments:
             comments_filename = f"reddit_data/comments_{subreddit_name}_{timestamp}.csv"
-            comments_df.to_csv(comments_filename, index=False)
-            print(f"Saved {len(all_comments)} comments to {comments_filename}")
+            write_rows_csv(comments, comments_filename)
+            print(f"Saved {len(comments)} comments to {comments_filename}")
         
-        time.sleep(2)
+        await asyncio.sleep(2)
+    
+    return posts, comments, users
+
+async def collect_reddit_data(reddit, subreddits, category, limit=100):
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SUBREDDITS)
+    results = await asyncio.gather(*[
+        collect_subreddit(reddit, subreddit_name, category, limit, semaphore)
+        for subreddit_name in subreddits
+    ])
+    
+    all_posts = []
+    all_comments = []
+    all_users = set()
+    for posts, comments, users in results:
+        all_posts.extend(posts)
+        all_comments.extend(comments)
+        all_users.update(users)
     
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     
     all_content = all_posts + all_comments
-    content_df = pd.DataFrame(all_content)
     content_filename = f"reddit_data/all_content_{category}_{timestamp}.csv"
-    content_df.to_csv(content_filename, index=False)
+    write_rows_csv(all_content, content_filename)
     print(f"Saved {len(all_content)} total items to {content_filename}")
     
-    users_df = pd.DataFrame(list(all_users), columns=['username'])
     users_filename = f"reddit_data/users_{category}_{timestamp}.csv"
-    users_df.to_csv(users_filename, index=False)
+    write_rows_csv(({'username': user} for user in all_users), users_filename, fieldnames=['username'])
     print(f"Saved {len(all_users)} unique users to {users_filename}")
     
     network_edges = []
     
+    post_authors = {}
+    for post in all_posts:
+        post_authors.setdefault(post['id'], post['author'])
+    comment_authors = {}
+    for c in all_comments:
+        comment_authors.setdefault(c['id'], c['author'])
+    
     for comment in all_comments:
         parent_id = comment['parent_id']
         
         parent_author = None
         
         if parent_id.startswith('t3_'):
-            post_id = parent_id[3:]
-            for post in all_posts:
-                if post['id'] == post_id:
-                    parent_author = post['author']
-                    break
+            parent_author = post_authors.get(parent_id[3:])
         elif parent_id.startswith('t1_'):
-            comment_id = parent_id[3:]
-            for c in all_comments:
-                if c['id'] == comment_id:
-                    parent_author = c['author']
-                    break
+            parent_author = comment_authors.get(parent_id[3:])
         
         if parent_author and comment['author'] != parent_author:
             edge = {
@@ -171,23 +209,23 @@ def collect_reddit_data(subreddits, category, limit=100):
             network_edges.append(edge)
     
     if network_edges:
-        edges_df = pd.DataFrame(network_edges)
         edges_filename = f"reddit_data/network_edges_{category}_{timestamp}.csv"
-        edges_df.to_csv(edges_filename, index=False)
+        write_rows_csv(network_edges, edges_filename)
         print(f"Saved {len(network_edges)} network edges to {edges_filename}")
     
     return all_content, all_users, network_edges
 
-def main():
-    print("Starting collection for misinformation subreddits...")
-    misinfo_content, misinfo_users, misinfo_edges = collect_reddit_data(
-        misinformation_subreddits, "misinformation"
-    )
-    
-    print("Starting collection for factual information subreddits...")
-    factual_content, factual_users, factual_edges = collect_reddit_data(
-        factual_subreddits, "factual"
-    )
+async def main():
+    async with create_reddit() as reddit:
+        print("Starting collection for misinformation subreddits...")
+        misinfo_content, misinfo_users, misinfo_edges = await collect_reddit_data(
+            reddit, misinformation_subreddits, "misinformation"
+        )
+        
+        print("Starting collection for factual information subreddits...")
+        factual_content, factual_users, factual_edges = await collect_reddit_data(
+            reddit, factual_subreddits, "factual"
+        )
     
     print("Data collection complete!")
     print(f"Collected {len(misinfo_content)} items from misinformation subreddits")
@@ -196,4 +234,4 @@ def main():
     print(f"Captured {len(misinfo_edges) + len(factual_edges)} network interactions")
     
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,44 @@
+import os
+import sys
+
+import networkx as nx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from csv_utils import DELETED_AUTHOR, fill_missing, read_csv
+from network_metrics import calculate_network_metrics, detect_communities
+
+EDGE_COLUMNS = ['source', 'target', 'subreddit', 'category', 'created_utc']
+EDGE_CATEGORICAL = ['source', 'target', 'subreddit', 'category']
+
+def write_edges(path, rows):
+    with open(path, 'w') as f:
+        f.write('source,target,subreddit,category,created_utc\n')
+        for source, target in rows:
+            f.write(f'{source},{target},sub,misinformation,2021-01-01 00:00:00\n')
+
+def load_graph(path):
+    edges = fill_missing(read_csv(path, EDGE_COLUMNS, EDGE_CATEGORICAL), ['source', 'target'], DELETED_AUTHOR)
+    return nx.from_pandas_edgelist(edges, source='source', target='target', create_using=nx.DiGraph())
+
+def test_deleted_author_survives_worker_processes(tmp_path, monkeypatch):
+    # str(None) authors are read as missing; they must end up as one node that the
+    # metric and community workers can still look up after the graphs are pickled
+    # The top-10 tables need at least ten users per network
+    users = [f'u{i}' for i in range(12)]
+    ring = list(zip(users, users[1:] + users[:1]))
+    write_edges(tmp_path / 'misinfo.csv', ring + [('u0', 'None'), ('u5', 'None'), ('None', 'u8')])
+    write_edges(tmp_path / 'factual.csv', ring)
+    misinfo_graph = load_graph(tmp_path / 'misinfo.csv')
+    factual_graph = load_graph(tmp_path / 'factual.csv')
+    
+    assert DELETED_AUTHOR in misinfo_graph
+    assert misinfo_graph.number_of_nodes() == 13
+    
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('results')
+    _, _, misinfo_pagerank, _ = calculate_network_metrics(misinfo_graph, factual_graph, parallel=True)
+    misinfo_communities, _ = detect_communities(misinfo_graph, factual_graph, parallel=True)
+    
+    assert set(misinfo_pagerank) == set(misinfo_graph)
+    assert set(misinfo_communities) == set(misinfo_graph)
@@ -0,0 +1,64 @@
+import os
+import sys
+
+import networkx as nx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import network_metrics
+from network_metrics import (
+    adjacency_csr,
+    average_path_length_sampled,
+    betweenness_centrality_approx,
+    largest_weak_component,
+    pagerank_gauss_seidel,
+    pagerank_sparse
+)
+
+def seeded_digraph():
+    # Sparse enough to leave dangling nodes and several weak components
+    return nx.gnp_random_graph(300, 0.01, seed=7, directed=True)
+
+@pytest.mark.parametrize('pagerank', [pagerank_sparse, pagerank_gauss_seidel])
+def test_pagerank_matches_networkx(pagerank):
+    graph = seeded_digraph()
+    expected = nx.pagerank(graph, tol=1e-10)
+    
+    scores = pagerank(graph, max_iter=500, tol=1e-9)
+    
+    assert set(scores) == set(expected)
+    assert max(abs(scores[node] - expected[node]) for node in graph) < 1e-6
+
+@pytest.mark.parametrize('backend', ['numba', 'networkx'])
+@pytest.mark.parametrize('directed', [True, False])
+def test_betweenness_with_every_source_is_exact(backend, directed, monkeypatch):
+    # NetworKit is skipped: its estimate samples sources even when k equals the node count
+    monkeypatch.setattr(network_metrics, 'nk', None)
+    if backend == 'networkx':
+        monkeypatch.setattr(network_metrics, 'betweenness_csr_numba', None)
+    elif network_metrics.betweenness_csr_numba is None:
+        pytest.skip('Numba is not installed')
+    graph = seeded_digraph() if directed else nx.gnp_random_graph(300, 0.01, seed=7)
+    expected = nx.betweenness_centrality(graph)
+    
+    scores = betweenness_centrality_approx(graph, k=graph.number_of_nodes(), seed=1, processes=2)
+    
+    assert set(scores) == set(expected)
+    assert max(abs(scores[node] - expected[node]) for node in graph) < 1e-9
+
+def test_average_path_length_matches_networkx():
+    graph = seeded_digraph()
+    A, nodelist = adjacency_csr(graph)
+    component = largest_weak_component(A)
+    undirected = graph.to_undirected().subgraph(nodelist[i] for i in component)
+    expected = nx.average_shortest_path_length(undirected)
+    
+    length, exact = average_path_length_sampled(A, component)
+    assert exact
+    assert abs(length - expected) < 1e-9
+    
+    # Sampling every node takes the estimate branch but must give the same mean
+    length, exact = average_path_length_sampled(A, component, n_sources=len(component), exact_limit=0)
+    assert not exact
+    assert abs(length - expected) < 1e-9
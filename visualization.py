@@ -2,59 +2,122 @@ import networkx as nx
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
-import seaborn as sns
-from collections import Counter
+import scipy.sparse as sp
+from scipy.optimize import minimize
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import eigsh, ArpackNoConvergence
+from scipy.spatial import ConvexHull
+from matplotlib.collections import LineCollection
+import heapq
+from network_metrics import pagerank_rustworkx, largest_weak_component_nodes, rustworkx_graph
+
+def _lbfgs_fr_layout(G, k=None, seed=42, maxiter=50, gravity_strength=1.0):
+    nodelist = list(G)
+    N = len(nodelist)
+    if N == 0:
+        return {}
+    if N == 1:
+        return {nodelist[0]: np.zeros(2)}
+    if k is None:
+        k = 1 / np.sqrt(N)
+    
+    A = nx.to_scipy_sparse_array(G, nodelist=nodelist, weight=None, format='csr')
+    edges = sp.triu((A + A.T) != 0, k=1).tocoo()
+    rows, cols = edges.row, edges.col
+    
+    def energy(flat):
+        x = flat.reshape(N, 2)
+        
+        delta = x[rows] - x[cols]
+        d = np.sqrt((delta ** 2).sum(axis=1))
+        attraction = (d ** 3).sum() / (3 * k)
+        edge_grad = (d / k)[:, None] * delta
+        grad = np.empty_like(x)
+        for axis in range(2):
+            grad[:, axis] = (np.bincount(rows, edge_grad[:, axis], minlength=N)
+                             - np.bincount(cols, edge_grad[:, axis], minlength=N))
+        
+        diff = x[:, None, :] - x[None, :, :]
+        d2 = (diff ** 2).sum(axis=-1)
+        np.fill_diagonal(d2, 1.0)
+        d2 = np.maximum(d2, 1e-12)
+        repulsion = -k * k * np.log(d2).sum() / 4
+        grad -= k * k * (diff / d2[:, :, None]).sum(axis=1)
+        
+        offset = x - x.mean(axis=0)
+        gravity = gravity_strength * (offset ** 2).sum() / 2
+        grad += gravity_strength * offset
+        
+        return attraction + repulsion + gravity, grad.ravel()
+    
+    x0 = np.random.default_rng(seed).random((N, 2))
+    result = minimize(energy, x0.ravel(), jac=True, method='L-BFGS-B', options={'maxiter': maxiter})
+    pos = nx.rescale_layout(result.x.reshape(N, 2))
+    return dict(zip(nodelist, pos))
+
+def _spectral_spring_layout(G, seed=42, iterations=20):
+    nodelist = list(G)
+    N = len(nodelist)
+    init = np.random.default_rng(seed).random((N, 2))
+    if N > 4 and G.number_of_edges() > 0:
+        A = nx.to_scipy_sparse_array(G, nodelist=nodelist, weight=None, dtype=np.float64, format='csr')
+        S = A + A.T
+        S.data[:] = 1
+        _, labels = connected_components(S, directed=False)
+        main = np.flatnonzero(labels == np.bincount(labels).argmax())
+        if len(main) > 4:
+            S = S[main][:, main]
+            inv_sqrt = 1 / np.sqrt(np.asarray(S.sum(axis=1)).ravel())
+            normalized = sp.diags(inv_sqrt) @ S @ sp.diags(inv_sqrt)
+            try:
+                _, vecs = eigsh(normalized, k=3, which='LA')
+                vecs = vecs[:, :2]
+                vecs = (vecs - vecs.min(axis=0)) / np.maximum(np.ptp(vecs, axis=0), 1e-12)
+                init[main] = 0.25 + 0.5 * vecs
+            except ArpackNoConvergence:
+                pass
+    return nx.spring_layout(G, pos=dict(zip(nodelist, init)), iterations=iterations, seed=seed)
 
 def visualize_networks_comparison(misinfo_graph, factual_graph):
-    misinfo_largest_cc = max(nx.weakly_connected_components(misinfo_graph), key=len)
-    factual_largest_cc = max(nx.weakly_connected_components(factual_graph), key=len)
+    misinfo_largest_cc = largest_weak_component_nodes(misinfo_graph)
+    factual_largest_cc = largest_weak_component_nodes(factual_graph)
     
     if len(misinfo_largest_cc) > 1000:
         misinfo_sample = list(misinfo_largest_cc)[:1000]
-        misinfo_viz_graph = misinfo_graph.subgraph(misinfo_sample).copy()
+        misinfo_viz_graph = misinfo_graph.subgraph(misinfo_sample)
         sample_note_misinfo = f" (showing 1000 of {len(misinfo_largest_cc)} nodes)"
     else:
-        misinfo_viz_graph = misinfo_graph.subgraph(misinfo_largest_cc).copy()
+        misinfo_viz_graph = misinfo_graph.subgraph(misinfo_largest_cc)
         sample_note_misinfo = ""
         
     if len(factual_largest_cc) > 1000:
         factual_sample = list(factual_largest_cc)[:1000]
-        factual_viz_graph = factual_graph.subgraph(factual_sample).copy()
+        factual_viz_graph = factual_graph.subgraph(factual_sample)
         sample_note_factual = f" (showing 1000 of {len(factual_largest_cc)} nodes)"
     else:
-        factual_viz_graph = factual_graph.subgraph(factual_largest_cc).copy()
+        factual_viz_graph = factual_graph.subgraph(factual_largest_cc)
         sample_note_factual = ""
     
     plt.figure(figsize=(18, 9))
     
     plt.subplot(1, 2, 1)
-    pos_misinfo = nx.spring_layout(misinfo_viz_graph, seed=42)
-    node_sizes = [misinfo_graph.degree(node) * 3 for node in misinfo_viz_graph.nodes()]
-    nx.draw_networkx(
-        misinfo_viz_graph,
-        pos=pos_misinfo,
-        with_labels=False,
-        node_size=node_sizes,
-        node_color='red',
-        alpha=0.7,
-        edge_color='lightgray',
-        arrows=False
-    )
+    pos_misinfo = _spectral_spring_layout(misinfo_viz_graph, seed=42)
+    misinfo_degree = dict(misinfo_graph.degree(misinfo_viz_graph))
+    node_sizes = [misinfo_degree[node] * 3 for node in misinfo_viz_graph.nodes()]
+    nx.draw_networkx_edges(misinfo_viz_graph, pos=pos_misinfo, alpha=0.7, edge_color='lightgray', arrows=False)
+    xy = np.array([pos_misinfo[node] for node in misinfo_viz_graph.nodes()])
+    plt.scatter(xy[:, 0], xy[:, 1], s=node_sizes, c='red', alpha=0.7, zorder=2)
+    plt.tick_params(axis='both', which='both', bottom=False, left=False, labelbottom=False, labelleft=False)
     plt.title(f"Misinformation Network{sample_note_misinfo}")
     
     plt.subplot(1, 2, 2)
-    pos_factual = nx.spring_layout(factual_viz_graph, seed=42)
-    node_sizes = [factual_graph.degree(node) * 3 for node in factual_viz_graph.nodes()]
-    nx.draw_networkx(
-        factual_viz_graph,
-        pos=pos_factual,
-        with_labels=False,
-        node_size=node_sizes,
-        node_color='blue',
-        alpha=0.7,
-        edge_color='lightgray',
-        arrows=False
-    )
+    pos_factual = _spectral_spring_layout(factual_viz_graph, seed=42)
+    factual_degree = dict(factual_graph.degree(factual_viz_graph))
+    node_sizes = [factual_degree[node] * 3 for node in factual_viz_graph.nodes()]
+    nx.draw_networkx_edges(factual_viz_graph, pos=pos_factual, alpha=0.7, edge_color='lightgray', arrows=False)
+    xy = np.array([pos_factual[node] for node in factual_viz_graph.nodes()])
+    plt.scatter(xy[:, 0], xy[:, 1], s=node_sizes, c='blue', alpha=0.7, zorder=2)
+    plt.tick_params(axis='both', which='both', bottom=False, left=False, labelbottom=False, labelleft=False)
     plt.title(f"Factual Information Network{sample_note_factual}")
     
     plt.tight_layout()
@@ -63,33 +126,34 @@ def visualize_networks_comparison(misinfo_graph, factual_graph):
     print("Network comparison visualization saved to results/network_comparison.png")
 
 def visualize_combined_network(combined_graph, misinfo_graph, factual_graph):
-    largest_cc = max(nx.weakly_connected_components(combined_graph), key=len)
+    combined_rx = rustworkx_graph(combined_graph)
+    largest_cc = largest_weak_component_nodes(combined_graph, rx_graph=combined_rx)
     
     misinfo_nodes = set(misinfo_graph.nodes())
     factual_nodes = set(factual_graph.nodes())
     crossposters = misinfo_nodes.intersection(factual_nodes)
-    crossposters_in_cc = list(crossposters.intersection(largest_cc))
+    crossposters_in_cc = crossposters & largest_cc
     
     sample_size = 1000
     
     if len(largest_cc) > sample_size:
-        pagerank = nx.pagerank(combined_graph, max_iter=100)
+        pagerank = pagerank_rustworkx(combined_graph, max_iter=100, tol=1e-4, rx_graph=combined_rx)
         
-        other_nodes = list(set(largest_cc) - set(crossposters_in_cc))
-        
-        other_nodes_sorted = sorted(other_nodes, key=lambda n: pagerank.get(n, 0), reverse=True)
+        other_nodes = largest_cc - crossposters_in_cc
         
         remaining_needed = min(sample_size - len(crossposters_in_cc), len(other_nodes))
-        sample_nodes = list(crossposters_in_cc) + other_nodes_sorted[:remaining_needed]
+        sample_nodes = list(crossposters_in_cc) + heapq.nlargest(
+            remaining_needed, other_nodes, key=lambda n: pagerank.get(n, 0)
+        )
         
         sample_note = f" (showing {len(sample_nodes)} of {len(largest_cc)} nodes, prioritizing cross-posters)"
     else:
         sample_nodes = list(largest_cc)
         sample_note = ""
     
-    viz_graph = combined_graph.subgraph(sample_nodes).copy()
+    viz_graph = combined_graph.subgraph(sample_nodes)
     
-    plt.figure(figsize=(16, 16), dpi=300)
+    plt.figure(figsize=(16, 16), dpi=150)
     
     G_undirected = viz_graph.to_undirected()
     
@@ -98,7 +162,10 @@ def visualize_combined_network(combined_graph, misinfo_graph, factual_graph):
         communities = community_louvain.best_partition(G_undirected)
     except ImportError:
         from networkx.algorithms import community
-        communities_generator = community.greedy_modularity_communities(G_undirected)
+        if hasattr(community, 'louvain_communities'):
+            communities_generator = community.louvain_communities(G_undirected, seed=42)
+        else:
+            communities_generator = community.greedy_modularity_communities(G_undirected)
         communities = {}
         for i, comm in enumerate(communities_generator):
             for node in comm:
@@ -109,63 +176,37 @@ def visualize_combined_network(combined_graph, misinfo_graph, factual_graph):
     community_colors = plt.cm.tab20(np.linspace(0, 1, num_communities))
     community_color_map = {comm_id: community_colors[i] for i, comm_id in enumerate(unique_communities)}
     
-    try:
-        from scipy.spatial import ConvexHull
-        pos = nx.fruchterman_reingold_layout(viz_graph, k=0.5, iterations=100, seed=42)
-        
-        for comm_id in unique_communities:
-            comm_nodes = [node for node, c_id in communities.items() if c_id == comm_id]
-            if len(comm_nodes) > 3:
-                comm_pos = {node: pos[node] for node in comm_nodes}
-                x_coords = [p[0] for p in comm_pos.values()]
-                y_coords = [p[1] for p in comm_pos.values()]
-                if len(x_coords) > 2:
-                    hull = ConvexHull(np.column_stack([x_coords, y_coords]))
-                    hull_points = [np.array([x_coords[i], y_coords[i]]) for i in hull.vertices]
-                    hull_points.append(hull_points[0])
-                    x_hull = [p[0] for p in hull_points]
-                    y_hull = [p[1] for p in hull_points]
-                    plt.fill(x_hull, y_hull, color=community_color_map[comm_id], alpha=0.1)
-    except ImportError:
-        pos = nx.fruchterman_reingold_layout(viz_graph, k=0.5, iterations=100, seed=42)
-        print("Warning: scipy not installed, skipping community highlighting")
+    pos = _lbfgs_fr_layout(viz_graph, k=0.5, seed=42)
     
-    nx.draw_networkx_edges(
-        viz_graph,
-        pos=pos,
-        alpha=0.3,
-        width=0.7,
-        arrowsize=10,
-        arrowstyle='->',
-        edge_color='gray'
-    )
+    coords = np.array([pos[node] for node in viz_graph], dtype=np.float64)
+    comm_ids = np.fromiter((communities[node] for node in viz_graph), dtype=np.int64, count=len(coords))
     
-    node_colors = []
-    node_sizes = []
+    for comm_id in unique_communities:
+        points = coords[comm_ids == comm_id]
+        if len(points) > 3:
+            hull = ConvexHull(points)
+            hull_points = points[hull.vertices]
+            hull_points = np.vstack([hull_points, hull_points[:1]])
+            plt.fill(hull_points[:, 0], hull_points[:, 1], color=community_color_map[comm_id], alpha=0.1)
     
-    for node in viz_graph.nodes():
-        if node in misinfo_nodes and node in factual_nodes:
-            color = 'purple'
-            size = min(300, viz_graph.degree(node) * 3)
-        elif node in misinfo_nodes:
-            color = 'red'
-            size = min(150, viz_graph.degree(node) * 1.5)
-        else:
-            color = 'blue'
-            size = min(150, viz_graph.degree(node) * 1.5)
-        
-        node_colors.append(color)
-        node_sizes.append(size)
+    segments = np.array([(pos[u], pos[v]) for u, v in viz_graph.edges()]).reshape(-1, 2, 2)
+    plt.gca().add_collection(LineCollection(
+        segments, colors='gray', linewidths=0.7, alpha=0.3, zorder=1, rasterized=True
+    ))
     
-    nx.draw_networkx_nodes(
-        viz_graph,
-        pos=pos,
-        node_size=node_sizes,
-        node_color=node_colors,
-        alpha=0.8
-    )
+    nodes = np.array(list(viz_graph.nodes()), dtype=object)
+    degree = np.fromiter((d for _, d in viz_graph.degree(nodes)), dtype=np.float64, count=len(nodes))
+    in_misinfo = np.fromiter((node in misinfo_nodes for node in nodes), dtype=bool, count=len(nodes))
+    in_factual = np.fromiter((node in factual_nodes for node in nodes), dtype=bool, count=len(nodes))
+    is_crossposter = in_misinfo & in_factual
+    
+    node_colors = np.where(is_crossposter, 'purple', np.where(in_misinfo, 'red', 'blue'))
+    node_sizes = np.where(is_crossposter, np.minimum(300, degree * 3), np.minimum(150, degree * 1.5))
     
-    pagerank = nx.pagerank(viz_graph, max_iter=100)
+    xy = np.array([pos[node] for node in nodes])
+    plt.scatter(xy[:, 0], xy[:, 1], s=node_sizes, c=node_colors, alpha=0.8, zorder=2)
+    
+    pagerank = pagerank_rustworkx(viz_graph, max_iter=100, tol=1e-4)
     top_nodes = sorted(pagerank.items(), key=lambda x: x[1], reverse=True)[:10]
     
     node_labels = {node: node for node, _ in top_nodes}
@@ -193,58 +234,63 @@ def visualize_combined_network(combined_graph, misinfo_graph, factual_graph):
     plt.axis('off')
     plt.tight_layout()
     
-    plt.savefig("results/enhanced_combined_network.png", dpi=300, bbox_inches='tight')
+    plt.savefig("results/enhanced_combined_network.png", dpi=150, bbox_inches='tight')
     print("Enhanced network visualization saved to results/enhanced_combined_network.png")
     plt.close()
 
+def _community_sizes(partition):
+    labels = np.fromiter(partition.values(), dtype=np.int64, count=len(partition))
+    return np.unique(labels, return_counts=True)
+
+def _top_communities(ids, sizes, n=10):
+    top = np.arange(len(sizes))
+    if len(sizes) > n:
+        top = np.argpartition(-sizes, n - 1)[:n]
+    top = top[np.argsort(-sizes[top], kind='stable')]
+    return ids[top], sizes[top]
+
 def visualize_community_sizes(misinfo_communities, factual_communities):
-    misinfo_sizes = Counter(misinfo_communities.values())
-    factual_sizes = Counter(factual_communities.values())
-    
-    misinfo_df = pd.DataFrame({
-        'Community': list(misinfo_sizes.keys()),
-        'Size': list(misinfo_sizes.values())
-    }).sort_values('Size', ascending=False)
-    
-    factual_df = pd.DataFrame({
-        'Community': list(factual_sizes.keys()),
-        'Size': list(factual_sizes.values())
-    }).sort_values('Size', ascending=False)
+    misinfo_ids, misinfo_sizes = _community_sizes(misinfo_communities)
+    factual_ids, factual_sizes = _community_sizes(factual_communities)
     
-    plt.figure(figsize=(12, 10))
+    fig = plt.figure(figsize=(12, 10))
     
     plt.subplot(2, 1, 1)
-    top_misinfo = misinfo_df.head(10)
-    sns.barplot(x='Community', y='Size', data=top_misinfo, color='red')
+    top_ids, top_sizes = _top_communities(misinfo_ids, misinfo_sizes)
+    plt.bar(top_ids.astype(str), top_sizes, color='red')
+    plt.xlabel('Community')
+    plt.ylabel('Size')
     plt.title('Top 10 Misinformation Communities by Size')
     plt.yscale('log')
     plt.xticks(rotation=45)
     
     plt.subplot(2, 1, 2)
-    top_factual = factual_df.head(10)
-    sns.barplot(x='Community', y='Size', data=top_factual, color='blue')
+    top_ids, top_sizes = _top_communities(factual_ids, factual_sizes)
+    plt.bar(top_ids.astype(str), top_sizes, color='blue')
+    plt.xlabel('Community')
+    plt.ylabel('Size')
     plt.title('Top 10 Factual Communities by Size')
     plt.yscale('log')
     plt.xticks(rotation=45)
     
     plt.tight_layout()
     plt.savefig("results/community_sizes.png", dpi=300, bbox_inches='tight')
-    plt.close()
     print("Community size visualization saved to results/community_sizes.png")
     
-    plt.figure(figsize=(12, 6))
+    fig.clf()
+    fig.set_size_inches(12, 6)
     
     plt.subplot(1, 2, 1)
-    misinfo_sizes_list = list(misinfo_sizes.values())
-    plt.hist(misinfo_sizes_list, bins=30, color='red', alpha=0.7)
+    counts, edges = np.histogram(misinfo_sizes, bins=30)
+    plt.bar(edges[:-1], counts, width=np.diff(edges), align='edge', color='red', alpha=0.7)
     plt.title('Misinformation Community Size Distribution')
     plt.xlabel('Community Size')
     plt.ylabel('Frequency')
     plt.yscale('log')
     
     plt.subplot(1, 2, 2)
-    factual_sizes_list = list(factual_sizes.values())
-    plt.hist(factual_sizes_list, bins=30, color='blue', alpha=0.7)
+    counts, edges = np.histogram(factual_sizes, bins=30)
+    plt.bar(edges[:-1], counts, width=np.diff(edges), align='edge', color='blue', alpha=0.7)
     plt.title('Factual Community Size Distribution')
     plt.xlabel('Community Size')
     plt.ylabel('Frequency')
@@ -252,7 +298,7 @@ def visualize_community_sizes(misinfo_communities, factual_communities):
     
     plt.tight_layout()
     plt.savefig("results/community_size_distribution.png", dpi=300, bbox_inches='tight')
-    plt.close()
+    plt.close(fig)
     print("Community size distribution saved to results/community_size_distribution.png")
 
 def visualize_subreddit_participation(misinfo_content, factual_content):
@@ -269,28 +315,32 @@ def visualize_subreddit_participation(misinfo_content, factual_content):
         'Count': factual_counts.values
     })
     
-    plt.figure(figsize=(14, 10))
+    fig = plt.figure(figsize=(14, 10))
     
     plt.subplot(2, 1, 1)
-    ax1 = sns.barplot(x='Subreddit', y='Count', data=misinfo_df, color='red')
+    ax1 = plt.gca()
+    ax1.bar(misinfo_df['Subreddit'].astype(str).to_numpy(), misinfo_df['Count'].to_numpy(), color='red')
+    ax1.set_xlabel('Subreddit')
+    ax1.set_ylabel('Count')
     plt.title('Participation in Misinformation Subreddits')
     plt.xticks(rotation=45)
-    for i, v in enumerate(misinfo_df['Count']):
-        ax1.text(i, v + 10, str(v), ha='center')
+    ax1.bar_label(ax1.containers[0], padding=3)
     
     plt.subplot(2, 1, 2)
-    ax2 = sns.barplot(x='Subreddit', y='Count', data=factual_df, color='blue')
+    ax2 = plt.gca()
+    ax2.bar(factual_df['Subreddit'].astype(str).to_numpy(), factual_df['Count'].to_numpy(), color='blue')
+    ax2.set_xlabel('Subreddit')
+    ax2.set_ylabel('Count')
     plt.title('Participation in Factual Subreddits')
     plt.xticks(rotation=45)
-    for i, v in enumerate(factual_df['Count']):
-        ax2.text(i, v + 10, str(v), ha='center')
+    ax2.bar_label(ax2.containers[0], padding=3)
     
     plt.tight_layout()
     plt.savefig("results/subreddit_participation.png", dpi=300, bbox_inches='tight')
-    plt.close()
     print("Subreddit participation visualization saved to results/subreddit_participation.png")
     
-    plt.figure(figsize=(16, 8))
+    fig.clf()
+    fig.set_size_inches(16, 8)
     
     plt.subplot(1, 2, 1)
     plt.pie(misinfo_counts.values, labels=misinfo_counts.index, autopct='%1.1f%%', startangle=90)
@@ -302,4 +352,4 @@ def visualize_subreddit_participation(misinfo_content, factual_content):
     
     plt.tight_layout()
     plt.savefig("results/subreddit_distribution.png", dpi=300, bbox_inches='tight')
-    plt
\ No newline at end of file
+    plt.close(fig)